@@ -7,6 +7,7 @@ from app.config import settings
 app = create_app()
 
 if __name__ == "__main__":
+    # Development server only; production runs gunicorn -c gunicorn_conf.py
     app.run(
         host=settings.HOST,
         port=settings.PORT,
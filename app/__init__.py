@@ -1,11 +1,14 @@
 """
 Flask application factory
 """
-from flask import Flask, jsonify, render_template, send_from_directory
+from flask import Flask, Response, jsonify, render_template, request, send_from_directory
 from flask_cors import CORS
+import hashlib
 import logging
 import os
 
+import orjson
+
 from app.config import settings
 
 
@@ -49,42 +52,52 @@ def create_app():
     def send_static(path):
         return send_from_directory(static_dir, path)
 
-    # API info endpoint
+    # API info endpoints: payloads are constant per process, so encode them once
+    api_root_body = orjson.dumps(
+        {
+            "name": settings.APP_NAME,
+            "version": settings.APP_VERSION,
+            "status": "running",
+            "endpoints": {
+                "events": f"{settings.API_PREFIX}/events",
+                "compliance": f"{settings.API_PREFIX}/compliance",
+                "stream": f"{settings.API_PREFIX}/stream",
+                "dashboard": "/",
+            },
+        }
+    )
+    api_info_body = orjson.dumps(
+        {
+            "name": settings.APP_NAME,
+            "version": settings.APP_VERSION,
+            "endpoints": {
+                "POST /events": "Submit single event",
+                "POST /events/batch": "Submit batch events",
+                "GET /events/health": "Health check",
+                "GET /compliance/distinct/<metric>": "Get distinct count",
+                "GET /compliance/activity/check": "Check user activity",
+                "GET /compliance/top/<metric>": "Get top K heavy hitters",
+                "GET /compliance/summary/<system>": "Get metrics summary",
+                "GET /stream": "Real-time event stream (SSE)",
+            },
+        }
+    )
+    api_root_etag = hashlib.blake2b(api_root_body).hexdigest()[:16]
+    api_info_etag = hashlib.blake2b(api_info_body).hexdigest()[:16]
+
+    def static_json(body: bytes, etag: str) -> Response:
+        """Serve pre-encoded JSON, answering 304 when the client's ETag matches"""
+        response = Response(body, mimetype="application/json")
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
     @app.route("/api")
     def api_root():
-        return jsonify(
-            {
-                "name": settings.APP_NAME,
-                "version": settings.APP_VERSION,
-                "status": "running",
-                "endpoints": {
-                    "events": f"{settings.API_PREFIX}/events",
-                    "compliance": f"{settings.API_PREFIX}/compliance",
-                    "stream": f"{settings.API_PREFIX}/stream",
-                    "dashboard": "/",
-                },
-            }
-        )
-
-    # API info endpoint
+        return static_json(api_root_body, api_root_etag)
+
     @app.route(f"{settings.API_PREFIX}")
     def api_info():
-        return jsonify(
-            {
-                "name": settings.APP_NAME,
-                "version": settings.APP_VERSION,
-                "endpoints": {
-                    "POST /events": "Submit single event",
-                    "POST /events/batch": "Submit batch events",
-                    "GET /events/health": "Health check",
-                    "GET /compliance/distinct/<metric>": "Get distinct count",
-                    "GET /compliance/activity/check": "Check user activity",
-                    "GET /compliance/top/<metric>": "Get top K heavy hitters",
-                    "GET /compliance/summary/<system>": "Get metrics summary",
-                    "GET /stream": "Real-time event stream (SSE)",
-                },
-            }
-        )
+        return static_json(api_info_body, api_info_etag)
 
     # Error handlers
     @app.errorhandler(404)
@@ -1,24 +1,176 @@
 """
 Compliance query API endpoints
 """
-from flask import Blueprint, request, jsonify
-from datetime import datetime
+from flask import Blueprint, Response, request
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Mapping, Optional
 import logging
+import math
+import threading
 
-from app.models.events import DistinctCountResponse, ActivityCheckResponse, TopKResponse
-from app.core.storage import RedisStorage
+import orjson
+from cachetools import TTLCache
+from ciso8601 import parse_datetime
+
+from app.core.storage_singleton import storage
 from app.core.processor import EventProcessor
 from app.utils.time_windows import TimeWindow, TimeWindowBucketer
+from app.utils.responses import json_response
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 compliance_bp = Blueprint("compliance", __name__, url_prefix="/api/v1/compliance")
 
-# Initialize storage and processor
-storage = RedisStorage()
+# Initialize processor on the shared storage
 processor = EventProcessor(storage)
 bucketer = TimeWindowBucketer()
 
+# Latency summary: fixed percentiles and common SLA thresholds (name, percentile, max ms)
+_LATENCY_PERCENTILES = (50, 90, 95, 99, 99.9)
+_LATENCY_SLAS = (
+    ("p95_under_200ms", 95, 200),
+    ("p99_under_500ms", 99, 500),
+)
+
+# Fixed-shape /sla/check body filled by %-formatting; strings are pre-escaped with orjson
+_SLA_BODY = (
+    b'{"metric":%b,"system":%b,"percentile":%d,"value":%.2f,"threshold":%r,'
+    b'"status":"%b","margin":%.2f,"window":"%b","timestamp":"%b"}'
+)
+
+# Lengths of the fixed-size windows in seconds (calendar months go through the bucketer)
+_WINDOW_SECONDS = {
+    TimeWindow.MINUTE: 60,
+    TimeWindow.FIVE_MINUTES: 300,
+    TimeWindow.FIFTEEN_MINUTES: 900,
+    TimeWindow.HOUR: 3600,
+    TimeWindow.DAY: 86400,
+    TimeWindow.WEEK: 604800,
+}
+
+# Short-lived cache of sketch reads: dashboards re-query the same bucket every few seconds
+_query_cache = TTLCache(maxsize=settings.QUERY_CACHE_SIZE, ttl=settings.QUERY_CACHE_TTL)
+_query_cache_lock = threading.Lock()
+# Cache-miss sentinel: storage reads can legitimately return None
+_MISS = object()
+
+
+@lru_cache(maxsize=32)
+def _parse_window(window_str: str) -> TimeWindow:
+    """Parse a window string once per distinct value (invalid values are not cached)"""
+    return bucketer.parse_window_string(window_str)
+
+
+def _parse_timestamp(timestamp_str: Optional[str]) -> datetime:
+    """
+    Parse an ISO-8601 query timestamp (``Z`` suffix included), defaulting to now
+
+    Returns naive UTC like the rest of the app (storage defaults to utcnow()),
+    so offset-carrying inputs are converted to UTC before key generation.
+    """
+    if not timestamp_str:
+        return datetime.utcnow()
+    timestamp = parse_datetime(timestamp_str)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def _bucket_id(timestamp: datetime, window: TimeWindow):
+    """
+    Identify the bucket containing ``timestamp`` with integer math
+
+    Uses wall-clock fields like the Redis key buckets do. Day 1 (0001-01-01) is a
+    Monday, so week ids line up with ISO weeks.
+
+    Args:
+        timestamp: Query timestamp
+        window: Time window
+
+    Returns:
+        Integer bucket id, or the bucket string for calendar months
+    """
+    window_seconds = _WINDOW_SECONDS.get(window)
+    if window_seconds is None:
+        return bucketer.bucket_timestamp(timestamp, window)
+    seconds = (
+        (timestamp.toordinal() - 1) * 86400
+        + timestamp.hour * 3600
+        + timestamp.minute * 60
+        + timestamp.second
+    )
+    return seconds // window_seconds
+
+
+@dataclass(slots=True)
+class CommonQuery:
+    """Query parameters shared by the compliance endpoints"""
+    system: Optional[str]
+    window_str: str
+    window: TimeWindow
+    timestamp: datetime
+
+
+def _common_params(args: Mapping[str, str], default_window: str = "1h") -> CommonQuery:
+    """
+    Extract system, window and timestamp from the query string in one pass
+
+    Args:
+        args: Request query arguments
+        default_window: Window used when the ``window`` param is absent
+
+    Returns:
+        Parsed CommonQuery (raises ValueError on an invalid window/timestamp)
+    """
+    window_str = args.get("window", default_window)
+    return CommonQuery(
+        system=args.get("system"),
+        window_str=window_str,
+        window=_parse_window(window_str),
+        timestamp=_parse_timestamp(args.get("timestamp")),
+    )
+
+
+@lru_cache(maxsize=64)
+def _percentile_key(percentile: float) -> str:
+    """Response key for a percentile, e.g. 95 -> p95 and 99.9 -> p999"""
+    if percentile == int(percentile):
+        return f"p{int(percentile)}"
+    return f"p{percentile}".replace(".", "")
+
+
+def _cached_query(
+    kind: str,
+    key: tuple,
+    window: TimeWindow,
+    timestamp: datetime,
+    loader: Callable[[], Any],
+) -> Any:
+    """
+    Return a cached storage read for the time bucket containing ``timestamp``
+
+    Args:
+        kind: Query kind (e.g., "hll", "topk")
+        key: Remaining cache key parts (metric, system, ...)
+        window: Time window
+        timestamp: Query timestamp (collapsed to its bucket)
+        loader: Callable performing the actual storage read on a miss
+
+    Returns:
+        Cached or freshly loaded value
+    """
+    cache_key = (kind, *key, window, _bucket_id(timestamp, window))
+    with _query_cache_lock:
+        value = _query_cache.get(cache_key, _MISS)
+    if value is _MISS:
+        value = loader()
+        with _query_cache_lock:
+            _query_cache[cache_key] = value
+    return value
+
 
 @compliance_bp.route("/distinct/<metric>", methods=["GET"])
 def get_distinct_count(metric: str):
@@ -44,41 +196,31 @@ def get_distinct_count(metric: str):
     """
     try:
         # Parse query parameters
-        system = request.args.get("system")
-        if not system:
-            return jsonify({"error": "system parameter is required"}), 400
-
-        window_str = request.args.get("window", "1h")
-        window = bucketer.parse_window_string(window_str)
-
-        timestamp_str = request.args.get("timestamp")
-        timestamp = (
-            datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            if timestamp_str
-            else datetime.utcnow()
-        )
+        q = _common_params(request.args)
+        if not q.system:
+            return json_response({"error": "system parameter is required"}, 400)
 
         # Query HyperLogLog
-        count = storage.get_hll_cardinality(metric, system, window, timestamp)
-
-        return (
-            jsonify(
-                DistinctCountResponse(
-                    metric=metric,
-                    system=system,
-                    window=window_str,
-                    count=count,
-                    accuracy="±2%",
-                ).model_dump()
-            ),
-            200,
+        count = _cached_query(
+            "hll", (metric, q.system), q.window, q.timestamp,
+            lambda: storage.get_hll_cardinality(metric, q.system, q.window, q.timestamp),
         )
 
+        # DistinctCountResponse shape, built directly (no pydantic validate/dump per request)
+        return json_response({
+            "metric": metric,
+            "system": q.system,
+            "window": q.window_str,
+            "count": count,
+            "accuracy": "±2%",
+            "timestamp": datetime.utcnow(),
+        }, 200)
+
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return json_response({"error": str(e)}, 400)
     except Exception as e:
         logger.error(f"Error querying distinct count: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}, 500)
 
 
 @compliance_bp.route("/activity/check", methods=["GET"])
@@ -107,44 +249,31 @@ def check_activity():
     """
     try:
         # Parse query parameters
+        q = _common_params(request.args, default_window="1d")
         user_id = request.args.get("user_id")
-        system = request.args.get("system")
-
-        if not user_id or not system:
-            return jsonify({"error": "user_id and system parameters are required"}), 400
 
-        window_str = request.args.get("window", "1d")
-        window = bucketer.parse_window_string(window_str)
-
-        timestamp_str = request.args.get("timestamp")
-        timestamp = (
-            datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            if timestamp_str
-            else datetime.utcnow()
-        )
+        if not user_id or not q.system:
+            return json_response({"error": "user_id and system parameters are required"}, 400)
 
         # Check Bloom filter
-        value = f"{user_id}:{system}"
-        accessed = storage.check_bloom("user_activity", system, value, timestamp, window)
-
-        return (
-            jsonify(
-                ActivityCheckResponse(
-                    user_id=user_id,
-                    system=system,
-                    window=window_str,
-                    accessed=accessed,
-                    probability=0.99 if accessed else 1.0,
-                ).model_dump()
-            ),
-            200,
-        )
+        value = f"{user_id}:{q.system}"
+        accessed = storage.check_bloom("user_activity", q.system, value, q.timestamp, q.window)
+
+        # ActivityCheckResponse shape
+        return json_response({
+            "user_id": user_id,
+            "system": q.system,
+            "window": q.window_str,
+            "accessed": accessed,
+            "probability": 0.99 if accessed else 1.0,
+            "note": "This is a probabilistic result",
+        }, 200)
 
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return json_response({"error": str(e)}, 400)
     except Exception as e:
         logger.error(f"Error checking activity: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}, 500)
 
 
 @compliance_bp.route("/top/<metric>", methods=["GET"])
@@ -173,34 +302,31 @@ def get_top_k(metric: str):
     """
     try:
         # Parse query parameters
-        system = request.args.get("system")
-        if not system:
-            return jsonify({"error": "system parameter is required"}), 400
+        q = _common_params(request.args)
+        if not q.system:
+            return json_response({"error": "system parameter is required"}, 400)
 
         k = int(request.args.get("k", 10))
-        window_str = request.args.get("window", "1h")
-        window = bucketer.parse_window_string(window_str)
-
-        timestamp_str = request.args.get("timestamp")
-        timestamp = (
-            datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            if timestamp_str
-            else datetime.utcnow()
-        )
 
         # Query TopK
-        items = storage.get_topk(metric, system, k, timestamp, window)
-
-        return (
-            jsonify(TopKResponse(metric=metric, window=window_str, items=items).model_dump()),
-            200,
+        items = _cached_query(
+            "topk", (metric, q.system, k), q.window, q.timestamp,
+            lambda: storage.get_topk(metric, q.system, k, q.timestamp, q.window),
         )
 
+        # TopKResponse shape
+        return json_response({
+            "metric": metric,
+            "window": q.window_str,
+            "items": items,
+            "timestamp": datetime.utcnow(),
+        }, 200)
+
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return json_response({"error": str(e)}, 400)
     except Exception as e:
         logger.error(f"Error querying top K: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}, 500)
 
 
 @compliance_bp.route("/summary/<system>", methods=["GET"])
@@ -230,19 +356,14 @@ def get_metrics_summary(system: str):
     }
     """
     try:
-        timestamp_str = request.args.get("timestamp")
-        timestamp = (
-            datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            if timestamp_str
-            else datetime.utcnow()
-        )
+        timestamp = _parse_timestamp(request.args.get("timestamp"))
 
         summary = processor.get_metrics_summary(system, timestamp)
-        return jsonify(summary), 200
+        return json_response(summary, 200)
 
     except Exception as e:
         logger.error(f"Error getting metrics summary: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}, 500)
 
 
 @compliance_bp.route("/snapshot/<date>", methods=["GET"])
@@ -261,19 +382,19 @@ def get_compliance_snapshot(date: str):
     }
     """
     try:
-        snapshot_date = datetime.fromisoformat(date)
+        snapshot_date = parse_datetime(date)
         snapshot = storage.get_compliance_snapshot(snapshot_date)
 
         if snapshot is None:
-            return jsonify({"error": "Snapshot not found"}), 404
+            return json_response({"error": "Snapshot not found"}, 404)
 
-        return jsonify(snapshot), 200
+        return json_response(snapshot, 200)
 
     except ValueError as e:
-        return jsonify({"error": f"Invalid date format: {str(e)}"}), 400
+        return json_response({"error": f"Invalid date format: {str(e)}"}, 400)
     except Exception as e:
         logger.error(f"Error getting snapshot: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}, 500)
 
 
 # =====================
@@ -310,43 +431,38 @@ def get_percentiles(metric: str):
     """
     try:
         # Parse query parameters
-        system = request.args.get("system")
-        if not system:
-            return jsonify({"error": "system parameter is required"}), 400
+        q = _common_params(request.args)
+        if not q.system:
+            return json_response({"error": "system parameter is required"}, 400)
 
         percentiles_str = request.args.get("percentiles", "50,95,99")
         percentiles = [float(p.strip()) for p in percentiles_str.split(",")]
 
-        window_str = request.args.get("window", "1h")
-        window = bucketer.parse_window_string(window_str)
-
-        timestamp_str = request.args.get("timestamp")
-        timestamp = (
-            datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            if timestamp_str
-            else datetime.utcnow()
-        )
-
         # Query T-Digest
-        results = storage.get_tdigest_percentiles(metric, system, percentiles, timestamp, window)
+        results = _cached_query(
+            "tdigest", (metric, q.system, tuple(percentiles)), q.window, q.timestamp,
+            lambda: storage.get_tdigest_percentiles(
+                metric, q.system, percentiles, q.timestamp, q.window
+            ),
+        )
 
         # Format response
-        percentile_dict = {f"p{int(p)}": v for p, v in results.items()}
+        percentile_dict = {_percentile_key(p): v for p, v in results.items()}
 
-        return jsonify({
+        return json_response({
             "metric": metric,
-            "system": system,
-            "window": window_str,
+            "system": q.system,
+            "window": q.window_str,
             "percentiles": percentile_dict,
             "unit": "milliseconds",  # configurable per metric
-            "timestamp": timestamp.isoformat()
-        }), 200
+            "timestamp": q.timestamp.isoformat()
+        }, 200)
 
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return json_response({"error": str(e)}, 400)
     except Exception as e:
         logger.error(f"Error querying percentiles: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}, 500)
 
 
 @compliance_bp.route("/sla/check", methods=["GET"])
@@ -380,53 +496,46 @@ def check_sla():
     """
     try:
         # Parse query parameters
+        q = _common_params(request.args)
         metric = request.args.get("metric")
-        system = request.args.get("system")
         threshold_str = request.args.get("threshold")
 
-        if not metric or not system or not threshold_str:
-            return jsonify({"error": "metric, system, and threshold parameters are required"}), 400
+        if not metric or not q.system or not threshold_str:
+            return json_response({"error": "metric, system, and threshold parameters are required"}, 400)
 
         percentile = float(request.args.get("percentile", "95"))
         threshold = float(threshold_str)
-
-        window_str = request.args.get("window", "1h")
-        window = bucketer.parse_window_string(window_str)
-
-        timestamp_str = request.args.get("timestamp")
-        timestamp = (
-            datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            if timestamp_str
-            else datetime.utcnow()
-        )
+        if not (math.isfinite(percentile) and math.isfinite(threshold)):
+            raise ValueError("percentile and threshold must be finite numbers")
 
         # Query T-Digest
-        value = storage.get_tdigest_percentile(metric, system, percentile, timestamp, window)
+        value = storage.get_tdigest_percentile(metric, q.system, percentile, q.timestamp, q.window)
 
         if value is None:
-            return jsonify({"error": "No data available for specified metric/system"}), 404
+            return json_response({"error": "No data available for specified metric/system"}, 404)
 
         # Check SLA
-        status = "PASS" if value < threshold else "FAIL"
+        status = b"PASS" if value < threshold else b"FAIL"
         margin = threshold - value
 
-        return jsonify({
-            "metric": metric,
-            "system": system,
-            "percentile": int(percentile),
-            "value": round(value, 2),
-            "threshold": threshold,
-            "status": status,
-            "margin": round(margin, 2),
-            "window": window_str,
-            "timestamp": timestamp.isoformat()
-        }), 200
+        body = _SLA_BODY % (
+            orjson.dumps(metric),
+            orjson.dumps(q.system),
+            int(percentile),
+            value,
+            threshold,
+            status,
+            margin,
+            q.window_str.encode(),
+            q.timestamp.isoformat().encode(),
+        )
+        return Response(body, status=200, mimetype="application/json")
 
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return json_response({"error": str(e)}, 400)
     except Exception as e:
         logger.error(f"Error checking SLA: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}, 500)
 
 
 @compliance_bp.route("/latency/summary/<system>", methods=["GET"])
@@ -462,49 +571,40 @@ def get_latency_summary(system: str):
     }
     """
     try:
+        q = _common_params(request.args)
         metric = request.args.get("metric", "api_latency")
-        window_str = request.args.get("window", "1h")
-        window = bucketer.parse_window_string(window_str)
-
-        timestamp_str = request.args.get("timestamp")
-        timestamp = (
-            datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            if timestamp_str
-            else datetime.utcnow()
-        )
 
         # Query percentiles
-        percentiles = [50, 90, 95, 99, 99.9]
-        results = storage.get_tdigest_percentiles(metric, system, percentiles, timestamp, window)
+        results = _cached_query(
+            "tdigest", (metric, system, _LATENCY_PERCENTILES), q.window, q.timestamp,
+            lambda: storage.get_tdigest_percentiles(
+                metric, system, list(_LATENCY_PERCENTILES), q.timestamp, q.window
+            ),
+        )
 
         # Format percentiles
-        percentile_dict = {}
-        for p, v in results.items():
-            if v is not None:
-                key = f"p{int(p)}" if p == int(p) else f"p{p}".replace(".", "")
-                percentile_dict[key] = round(v, 2)
+        percentile_dict = {
+            _percentile_key(p): round(v, 2) for p, v in results.items() if v is not None
+        }
 
         # Check common SLA thresholds
-        sla_status = {}
-        p95 = results.get(95)
-        p99 = results.get(99)
-
-        if p95 is not None:
-            sla_status["p95_under_200ms"] = "PASS" if p95 < 200 else "FAIL"
-        if p99 is not None:
-            sla_status["p99_under_500ms"] = "PASS" if p99 < 500 else "FAIL"
+        sla_status = {
+            name: "PASS" if results[p] < threshold else "FAIL"
+            for name, p, threshold in _LATENCY_SLAS
+            if results.get(p) is not None
+        }
 
-        return jsonify({
+        return json_response({
             "system": system,
             "metric": metric,
-            "window": window_str,
+            "window": q.window_str,
             "percentiles": percentile_dict,
             "sla_status": sla_status,
-            "timestamp": timestamp.isoformat()
-        }), 200
+            "timestamp": q.timestamp.isoformat()
+        }, 200)
 
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return json_response({"error": str(e)}, 400)
     except Exception as e:
         logger.error(f"Error getting latency summary: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}, 500)
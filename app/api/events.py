@@ -1,30 +1,33 @@
 """
 Event ingestion API endpoints
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint
 from datetime import datetime
-import uuid
+import secrets
 import logging
 
-from app.models.events import Event, BatchEventRequest, EventResponse
+from app.models.events import Event, EventResponse, event_list_adapter, warm_up_models
 from app.core.processor import EventProcessor
-from app.core.storage import RedisStorage
+from app.core.storage_singleton import storage
+from app.utils.responses import json_body, json_response
 
 logger = logging.getLogger(__name__)
 
 events_bp = Blueprint("events", __name__, url_prefix="/api/v1/events")
 
-# Initialize storage and processor
-storage = RedisStorage()
+# Initialize processor on the shared storage
 processor = EventProcessor(storage)
 
+warm_up_models()
+
 
 @events_bp.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint"""
     redis_ok = storage.ping()
-    return jsonify({"status": "healthy" if redis_ok else "unhealthy", "redis": redis_ok}), (
-        200 if redis_ok else 503
+    return json_response(
+        {"status": "healthy" if redis_ok else "unhealthy", "redis": redis_ok},
+        200 if redis_ok else 503,
     )
 
 
@@ -45,49 +48,44 @@ def submit_event():
     Response:
     {
       "success": true,
-      "event_id": "uuid",
+      "event_id": "32-char hex id",
       "message": "Event processed successfully"
     }
     """
     try:
-        data = request.get_json()
+        data = json_body()
 
         # Validate and parse event
-        event = Event(**data)
+        event = Event.model_validate(data)
 
         # Process event
         processor.process_event(event)
 
-        # Return success
-        return (
-            jsonify(
-                EventResponse(
-                    success=True,
-                    event_id=str(uuid.uuid4()),
-                    message="Event processed successfully",
-                ).model_dump()
-            ),
+        # Return success (same shape as EventResponse, without building the model)
+        return json_response(
+            {
+                "success": True,
+                "event_id": secrets.token_hex(16),
+                "message": "Event processed successfully",
+                "timestamp": datetime.utcnow(),
+            },
             201,
         )
 
     except ValueError as e:
         logger.warning(f"Invalid event data: {e}")
-        return (
-            jsonify(
-                EventResponse(
-                    success=False, message=f"Invalid event data: {str(e)}"
-                ).model_dump()
-            ),
+        return json_response(
+            EventResponse(
+                success=False, message=f"Invalid event data: {str(e)}"
+            ).model_dump(),
             400,
         )
     except Exception as e:
         logger.error(f"Error processing event: {e}", exc_info=True)
-        return (
-            jsonify(
-                EventResponse(
-                    success=False, message="Internal server error"
-                ).model_dump()
-            ),
+        return json_response(
+            EventResponse(
+                success=False, message="Internal server error"
+            ).model_dump(),
             500,
         )
 
@@ -114,32 +112,32 @@ def submit_batch():
     }
     """
     try:
-        data = request.get_json()
+        data = json_body()
 
         # Validate batch request
-        batch = BatchEventRequest(**data)
+        if not isinstance(data, dict) or "events" not in data:
+            raise ValueError("Request body must be an object with an 'events' list")
+        events = event_list_adapter.validate_python(data["events"])
 
         # Process events
-        processed = processor.process_batch(batch.events)
-
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "processed": processed,
-                    "total": len(batch.events),
-                    "message": f"Processed {processed}/{len(batch.events)} events",
-                }
-            ),
+        processed = processor.process_batch(events)
+
+        return json_response(
+            {
+                "success": True,
+                "processed": processed,
+                "total": len(events),
+                "message": f"Processed {processed}/{len(events)} events",
+            },
             201,
         )
 
     except ValueError as e:
         logger.warning(f"Invalid batch data: {e}")
-        return jsonify({"success": False, "message": f"Invalid batch data: {str(e)}"}), 400
+        return json_response({"success": False, "message": f"Invalid batch data: {str(e)}"}, 400)
     except Exception as e:
         logger.error(f"Error processing batch: {e}", exc_info=True)
-        return jsonify({"success": False, "message": "Internal server error"}), 500
+        return json_response({"success": False, "message": "Internal server error"}, 500)
 
 
 @events_bp.route("/stats", methods=["GET"])
@@ -156,7 +154,7 @@ def get_stats():
     """
     try:
         stats = storage.get_stats()
-        return jsonify(stats), 200
+        return json_response(stats, 200)
     except Exception as e:
         logger.error(f"Error getting stats: {e}", exc_info=True)
-        return jsonify({"error": "Failed to get stats"}), 500
+        return json_response({"error": "Failed to get stats"}, 500)
@@ -3,18 +3,24 @@ Server-Sent Events (SSE) streaming API
 Real-time event updates for dashboard
 """
 from flask import Blueprint, Response
-import json
 import time
 import logging
 
-from app.core.storage import RedisStorage
+import orjson
+
+from app.core.storage_singleton import storage
 from app.config import settings
+from app.utils.responses import json_body, json_response
 
 logger = logging.getLogger(__name__)
 
 stream_bp = Blueprint("stream", __name__, url_prefix="/api/v1")
 
-storage = RedisStorage()
+# Pre-encoded SSE frames: the stream yields bytes so WSGI never re-encodes them
+CONNECTED_FRAME = (
+    b"data: " + orjson.dumps({"type": "connected", "message": "Stream connected"}) + b"\n\n"
+)
+HEARTBEAT_FRAME = b": heartbeat\n\n"
 
 
 def event_stream():
@@ -24,39 +30,68 @@ def event_stream():
     """
     pubsub = storage.subscribe_to_events()
 
+    # Frames are buffered for up to SSE_FLUSH_INTERVAL_MS (or SSE_FLUSH_BYTES) so
+    # bursts of events reach the client in a few larger writes
+    flush_interval = settings.SSE_FLUSH_INTERVAL_MS / 1000.0
+    flush_bytes = settings.SSE_FLUSH_BYTES
+    heartbeat_interval = settings.SSE_HEARTBEAT_INTERVAL
+
+    # Loop-invariant lookups bound once per stream
+    monotonic = time.monotonic
+    get_message = pubsub.get_message
+
     try:
         # Send initial connection message
-        yield f"data: {json.dumps({'type': 'connected', 'message': 'Stream connected'})}\n\n"
+        yield CONNECTED_FRAME
+
+        buffer = bytearray()
+        flush_deadline = 0.0
+        last_sent = monotonic()
+
+        while True:
+            # Wait until the pending batch is due, or until a heartbeat is due when idle
+            now = monotonic()
+            if buffer:
+                timeout = max(0.0, flush_deadline - now)
+            else:
+                timeout = max(0.0, last_sent + heartbeat_interval - now)
 
-        last_heartbeat = time.time()
+            message = get_message(ignore_subscribe_messages=True, timeout=timeout)
 
-        for message in pubsub.listen():
-            # Handle Redis pub/sub messages
-            if message["type"] == "message":
-                # Parse and forward event
+            if message is not None:
+                # Queue event (published payloads are already JSON bytes)
                 try:
                     data = message["data"]
-                    if isinstance(data, bytes):
-                        data = data.decode("utf-8")
+                    if not isinstance(data, bytes):
+                        data = data.encode("utf-8")
 
-                    yield f"data: {data}\n\n"
+                    if not buffer:
+                        flush_deadline = monotonic() + flush_interval
+                    buffer += b"data: " + data + b"\n\n"
 
                 except Exception as e:
                     logger.error(f"Error processing message: {e}")
 
-            # Send periodic heartbeat to keep connection alive
-            current_time = time.time()
-            if current_time - last_heartbeat > settings.SSE_HEARTBEAT_INTERVAL:
-                yield f": heartbeat\n\n"
-                last_heartbeat = current_time
+                if len(buffer) < flush_bytes and monotonic() < flush_deadline:
+                    continue
+
+            now = monotonic()
+            if buffer:
+                yield bytes(buffer)
+                buffer.clear()
+                last_sent = now
+            elif now - last_sent >= heartbeat_interval:
+                # Send heartbeat to keep idle connections alive
+                yield HEARTBEAT_FRAME
+                last_sent = now
 
     except GeneratorExit:
         logger.info("Client disconnected from event stream")
-        pubsub.close()
     except Exception as e:
         logger.error(f"Error in event stream: {e}", exc_info=True)
-        pubsub.close()
         raise
+    finally:
+        pubsub.close()
 
 
 @stream_bp.route("/stream", methods=["GET"])
@@ -100,6 +135,7 @@ def test_stream():
     {
       "message": "Test event"
     }
+    or a list of such objects to publish several events in one round-trip
 
     Response:
     {
@@ -108,19 +144,18 @@ def test_stream():
     }
     """
     try:
-        from flask import request
-
-        data = request.get_json() or {}
-        test_event = {
-            "type": "test",
-            "message": data.get("message", "Test event"),
-            "timestamp": time.time(),
-        }
+        data = json_body(default={})
+        now = time.time()
+        test_events = [
+            {"type": "test", "message": item.get("message", "Test event"), "timestamp": now}
+            for item in (data if isinstance(data, list) else [data])
+        ]
 
-        storage.publish_event(test_event)
+        storage.publish_events(test_events)
 
-        return json.dumps({"success": True, "message": "Event published"}), 200
+        message = "Event published" if len(test_events) == 1 else f"{len(test_events)} events published"
+        return json_response({"success": True, "message": message}, 200)
 
     except Exception as e:
         logger.error(f"Error publishing test event: {e}", exc_info=True)
-        return json.dumps({"success": False, "error": str(e)}), 500
+        return json_response({"success": False, "error": str(e)}, 500)
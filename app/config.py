@@ -2,6 +2,7 @@
 Configuration management for PaperTrail Modern
 """
 import os
+from functools import cached_property, lru_cache
 from typing import List
 from pydantic_settings import BaseSettings
 
@@ -22,6 +23,8 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
     REDIS_URL: str = ""
+    REDIS_MAX_CONNECTIONS: int = 256
+    REDIS_POOL_TIMEOUT: int = 5
 
     # HyperLogLog Settings
     HLL_ERROR_RATE: float = 0.02  # 2% error rate
@@ -29,6 +32,7 @@ class Settings(BaseSettings):
     # Bloom Filter Settings
     BLOOM_CAPACITY: int = 1_000_000  # 1M items
     BLOOM_ERROR_RATE: float = 0.001  # 0.1% false positive rate
+    BLOOM_USE_REDISBLOOM: bool = True  # Use server-side BF.* commands when the module is loaded
 
     # Count-Min Sketch Settings
     CMS_WIDTH: int = 1000
@@ -44,25 +48,54 @@ class Settings(BaseSettings):
     API_PREFIX: str = "/api/v1"
     CORS_ORIGINS: List[str] = ["*"]
 
+    # Query Cache (compliance reads)
+    QUERY_CACHE_SIZE: int = 10_000
+    QUERY_CACHE_TTL: int = 5  # seconds
+
     # Event Processing
     MAX_BATCH_SIZE: int = 1000
     WORKER_THREADS: int = 4
 
     # SSE Settings
     SSE_HEARTBEAT_INTERVAL: int = 30  # seconds
+    SSE_MAX_CONNECTIONS: int = 1000  # concurrent streams per process (gevent worker_connections)
+    SSE_FLUSH_INTERVAL_MS: int = 10  # max time a frame waits to be batched
+    SSE_FLUSH_BYTES: int = 16 * 1024  # flush early once this many bytes are buffered
 
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
 
-    def get_redis_url(self) -> str:
-        """Get Redis connection URL"""
+    @cached_property
+    def redis_url(self) -> str:
+        """Redis connection URL, built once per Settings instance"""
         if self.REDIS_URL:
             return self.REDIS_URL
 
         auth = f":{self.REDIS_PASSWORD}@" if self.REDIS_PASSWORD else ""
         return f"redis://{auth}{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
 
+    def get_redis_url(self) -> str:
+        """Get Redis connection URL"""
+        return self.redis_url
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Build the process-wide Settings once
+
+    Set PAPERTRAIL_SKIP_ENV_FILE=1 in worker processes whose environment is
+    already populated (e.g. inherited from the gunicorn master) to skip
+    re-reading the .env file.
+
+    Returns:
+        Cached Settings instance
+    """
+    if os.environ.get("PAPERTRAIL_SKIP_ENV_FILE"):
+        return Settings(_env_file=None)
+    return Settings()
+
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
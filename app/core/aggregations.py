@@ -7,10 +7,11 @@ High-level operations for:
 - Distributed processing
 """
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, TypeVar, Generic
+from typing import List, Dict, Iterable, Optional, Tuple, TypeVar, Generic
 import logging
+import operator
 
-from app.core.monoid import Monoid
+from app.core.monoid import Monoid, sum_monoid, tree_reduce
 from app.core.monoids.hll_monoid import HLLMonoid
 from app.core.monoids.bloom_monoid import BloomFilterUnionMonoid
 from app.core.monoids.topk_monoid import TopKMonoid
@@ -71,7 +72,7 @@ class TimeWindowAggregator(Generic[T]):
         else:
             items = list(windows.values())
 
-        return self.monoid.sum(items)
+        return sum_monoid(self.monoid, items)
 
     def aggregate_last_n_windows(
         self,
@@ -122,11 +123,8 @@ class HLLTimeWindowAggregator:
 
         Returns:
             Daily HLL with deduplicated cardinality
-
-        Note: With algesnake, this is now a simple sum()!
         """
-        # Use algesnake's native sum() - much simpler!
-        return sum(hourly_hlls.values())
+        return self.monoid.fast_merge(hourly_hlls.values())
 
     def daily_to_weekly(self, daily_hlls: Dict[str, HyperLogLog]) -> HyperLogLog:
         """
@@ -137,11 +135,8 @@ class HLLTimeWindowAggregator:
 
         Returns:
             Weekly HLL
-
-        Note: With algesnake, this is now a simple sum()!
         """
-        # Use algesnake's native sum() - much simpler!
-        return sum(daily_hlls.values())
+        return self.monoid.fast_merge(daily_hlls.values())
 
     def rolling_window(
         self,
@@ -158,7 +153,8 @@ class HLLTimeWindowAggregator:
         Returns:
             HLL for rolling window
         """
-        return self.aggregator.aggregate_last_n_windows(hourly_hlls, n=hours)
+        recent_keys = sorted(hourly_hlls.keys(), reverse=True)[:hours]
+        return self.monoid.fast_merge(hourly_hlls[key] for key in recent_keys)
 
 
 class MultiSystemAggregator(Generic[T]):
@@ -189,7 +185,7 @@ class MultiSystemAggregator(Generic[T]):
             }
             total = aggregator.aggregate_systems(system_hlls)
         """
-        return self.monoid.sum(list(systems.values()))
+        return sum_monoid(self.monoid, list(systems.values()))
 
     def aggregate_subset(self, systems: Dict[str, T], system_names: List[str]) -> T:
         """
@@ -203,7 +199,7 @@ class MultiSystemAggregator(Generic[T]):
             Aggregated result for specified systems
         """
         items = [systems[name] for name in system_names if name in systems]
-        return self.monoid.sum(items)
+        return sum_monoid(self.monoid, items)
 
 
 class DistributedAggregator(Generic[T]):
@@ -232,7 +228,7 @@ class DistributedAggregator(Generic[T]):
             worker_hlls = [worker1_hll, worker2_hll, worker3_hll]
             final = aggregator.aggregate_workers(worker_hlls)
         """
-        return self.monoid.sum(worker_results)
+        return sum_monoid(self.monoid, worker_results)
 
     def aggregate_with_metadata(
         self,
@@ -248,7 +244,7 @@ class DistributedAggregator(Generic[T]):
             (combined_result, worker_count, worker_ids)
         """
         results = list(worker_results.values())
-        combined = self.monoid.sum(results)
+        combined = sum_monoid(self.monoid, results)
         return (combined, len(results), list(worker_results.keys()))
 
 
@@ -296,7 +292,7 @@ class CompositeAggregator:
         for system_data in data.values():
             all_items.extend(system_data.values())
 
-        return self.monoid.sum(all_items)
+        return sum_monoid(self.monoid, all_items)
 
     def aggregate_by_system(
         self,
@@ -339,20 +335,36 @@ class CompositeAggregator:
             result = aggregator.aggregate_by_time(data)
             # {"2025-10-16T00:00:00": HLL(...), ...}
         """
-        # Invert the nesting: time_window -> {system: data}
-        time_to_systems = {}
-        for system_name, time_windows in data.items():
-            for time_window, data_structure in time_windows.items():
-                if time_window not in time_to_systems:
-                    time_to_systems[time_window] = {}
-                time_to_systems[time_window][system_name] = data_structure
+        return self.aggregate_by_time_flat(
+            (time_window, data_structure)
+            for time_windows in data.values()
+            for time_window, data_structure in time_windows.items()
+        )
 
-        # Aggregate per time window
-        result = {}
-        for time_window, system_data in time_to_systems.items():
-            result[time_window] = self.system_agg.aggregate_systems(system_data)
+    def aggregate_by_time_flat(self, rows: Iterable[Tuple[str, T]]) -> Dict[str, T]:
+        """
+        Aggregate flat (time_window, data_structure) rows per time window
 
-        return result
+        Groups in a single scan into one list per window (no per-window
+        {system: data} dicts), then sums each group once.
+
+        Args:
+            rows: Iterable of (time_window, data_structure) pairs
+
+        Returns:
+            Dict mapping time_window to aggregated result
+        """
+        groups: Dict[str, List[T]] = {}
+        get = groups.get
+        for time_window, data_structure in rows:
+            group = get(time_window)
+            if group is None:
+                groups[time_window] = [data_structure]
+            else:
+                group.append(data_structure)
+
+        monoid = self.monoid
+        return {time_window: sum_monoid(monoid, items) for time_window, items in groups.items()}
 
 
 # ============================================================
@@ -368,14 +380,11 @@ def merge_hourly_to_daily_hll(hourly_hlls: List[HyperLogLog]) -> HyperLogLog:
 
     Returns:
         Daily HLL
-
-    Note: With algesnake, this is now a simple sum()!
     """
     if not hourly_hlls:
         return HyperLogLog()
 
-    # Use algesnake's native sum() - much simpler!
-    return sum(hourly_hlls)
+    return HLLMonoid(precision=hourly_hlls[0].precision).fast_merge(hourly_hlls)
 
 
 def merge_systems_hll(system_hlls: Dict[str, HyperLogLog]) -> HyperLogLog:
@@ -387,14 +396,12 @@ def merge_systems_hll(system_hlls: Dict[str, HyperLogLog]) -> HyperLogLog:
 
     Returns:
         Combined HLL
-
-    Note: With algesnake, this is now a simple sum()!
     """
     if not system_hlls:
         return HyperLogLog()
 
-    # Use algesnake's native sum() - much simpler!
-    return sum(system_hlls.values())
+    hlls = list(system_hlls.values())
+    return HLLMonoid(precision=hlls[0].precision).fast_merge(hlls)
 
 
 def merge_topk_windows(topk_list: List[TopK]) -> TopK:
@@ -407,10 +414,9 @@ def merge_topk_windows(topk_list: List[TopK]) -> TopK:
     Returns:
         Merged TopK
 
-    Note: With algesnake, this is now a simple sum()!
+    Note: algesnake TopK merges with the + operator
     """
     if not topk_list:
         return TopK()
 
-    # Use algesnake's native sum() - much simpler!
-    return sum(topk_list)
+    return tree_reduce(operator.add, topk_list)
@@ -14,8 +14,11 @@ This enables:
 MIGRATION NOTE: This module now uses algesnake library for improved performance
 and better API ergonomics while maintaining backward compatibility.
 """
-from typing import TypeVar, Generic, List, Optional
-from functools import reduce
+from typing import Callable, TypeVar, Generic, Iterable, List, Optional
+from functools import singledispatch
+import builtins
+import itertools
+import math
 
 # Import algesnake abstract classes
 from algesnake.abstract import Monoid as AlgesnakeMonoid
@@ -25,11 +28,44 @@ from algesnake.abstract import Ring as AlgesnakeRing
 
 # Import concrete monoid implementations from algesnake
 from algesnake import Add, Multiply, Max, Min
-from algesnake import SetMonoid, ListMonoid, StringMonoid
+from algesnake import SetMonoid as AlgesnakeSetMonoid
+from algesnake import ListMonoid as AlgesnakeListMonoid
+from algesnake import StringMonoid as AlgesnakeStringMonoid
 
 T = TypeVar('T')
 
 
+def tree_reduce(plus: Callable[[T, T], T], items: Iterable[T]) -> T:
+    """
+    Combine items with a balanced pairwise (tree) reduction
+
+    Merges neighbours level by level instead of folding left. The number of
+    plus() calls matches functools.reduce, but merges see equally sized
+    operands and large sketches (HLL, Bloom, TopK) keep fewer intermediates
+    alive. Order is preserved, so non-commutative operations are safe.
+
+    Args:
+        plus: Associative binary operation
+        items: Non-empty iterable of elements
+
+    Returns:
+        Combined result
+
+    Raises:
+        ValueError: If items is empty
+    """
+    items = list(items)
+    if not items:
+        raise ValueError("tree_reduce() of empty sequence")
+
+    while len(items) > 1:
+        paired = [plus(items[i], items[i + 1]) for i in range(0, len(items) - 1, 2)]
+        if len(items) % 2:
+            paired.append(items[-1])
+        items = paired
+    return items[0]
+
+
 # ============================================================
 # Compatibility Layer: Maintain backward compatibility
 # ============================================================
@@ -46,6 +82,24 @@ class Monoid(AlgesnakeMonoid[T]):
     2. Associativity: plus(plus(a, b), c) == plus(a, plus(b, c))
     """
 
+    def sum(self, items: Iterable[T]) -> T:
+        """
+        Sum elements with a balanced pairwise reduction (see tree_reduce)
+
+        Args:
+            items: Elements to combine
+
+        Returns:
+            Combined result (zero() for no items)
+        """
+        items = list(items)
+        if not items:
+            return self.zero()
+        if len(items) == 1:
+            # Keep returning a fresh value rather than aliasing the input
+            return self.plus(self.zero(), items[0])
+        return tree_reduce(self.plus, items)
+
     def sum_option(self, items: List[Optional[T]]) -> Optional[T]:
         """
         Sum a list of optional elements, skipping None values
@@ -82,7 +136,7 @@ class SemigroupLike(AlgessnakeSemigroup[T]):
         """
         if not items:
             return None
-        return reduce(self.plus, items)
+        return tree_reduce(self.plus, items)
 
 
 class Ring(AlgesnakeRing[T]):
@@ -121,15 +175,66 @@ class Group(AlgesnakeGroup[T]):
 # Concrete Monoid Implementations - Using algesnake
 # ============================================================
 
-# Re-export algesnake monoids with backward-compatible names
-IntMonoid = Add  # algesnake's Add monoid for integers
-FloatMonoid = Add  # algesnake's Add also works for floats
+# algesnake's numeric monoids with sum() routed to builtin C loops instead of
+# one plus() call per element. Subclassing keeps isinstance(…, Add/Max/Min) true.
+
+class IntMonoid(Add):
+    """Integer addition monoid"""
+
+    def sum(self, items: Iterable[int]) -> int:
+        """Sum with the builtin sum()"""
+        return builtins.sum(items, self.zero())
+
+
+class FloatMonoid(Add):
+    """Float addition monoid"""
+
+    def sum(self, items: Iterable[float]) -> float:
+        """Sum with math.fsum (C loop, no accumulated rounding error)"""
+        return math.fsum(items)
+
+
+class MaxMonoid(Max):
+    """Max monoid"""
+
+    def sum(self, items: Iterable[T]) -> T:
+        """Largest item, or zero() (-inf) for no items"""
+        return max(items, default=self.zero())
+
+
+class MinMonoid(Min):
+    """Min monoid"""
+
+    def sum(self, items: Iterable[T]) -> T:
+        """Smallest item, or zero() (+inf) for no items"""
+        return min(items, default=self.zero())
+
 
-# algesnake's concrete implementations are already optimal
-MaxMonoid = Max  # algesnake's Max monoid
-MinMonoid = Min  # algesnake's Min monoid
+# Collection monoids: folding with plus() copies the growing accumulator on
+# every step (quadratic); these build the result once in O(total size).
 
-# Note: StringMonoid, ListMonoid, SetMonoid are already imported from algesnake above
+class StringMonoid(AlgesnakeStringMonoid):
+    """String concatenation monoid"""
+
+    def sum(self, items: Iterable[str]) -> str:
+        """Concatenate with str.join"""
+        return "".join(items)
+
+
+class ListMonoid(AlgesnakeListMonoid):
+    """List concatenation monoid"""
+
+    def sum(self, items: Iterable[list]) -> list:
+        """Concatenate with itertools.chain"""
+        return list(itertools.chain.from_iterable(items))
+
+
+class SetMonoid(AlgesnakeSetMonoid):
+    """Set union monoid"""
+
+    def sum(self, items: Iterable[set]) -> set:
+        """Union all sets in a single set.union call"""
+        return set().union(*items)
 
 
 # ============================================================
@@ -153,9 +258,16 @@ class Aggregator(Generic[T]):
         return self
 
     def append_all(self, values: List[T]) -> 'Aggregator[T]':
-        """Add multiple values"""
-        for value in values:
-            self.append(value)
+        """
+        Add multiple values
+
+        Sums the batch once (bulk monoid sum) and folds that into the
+        accumulator with a single plus(), instead of one append per value.
+        """
+        values = list(values)
+        if values:
+            monoid = self.monoid
+            self.accumulated = monoid.plus(self.accumulated, sum_monoid(monoid, values))
         return self
 
     def get(self) -> T:
@@ -177,10 +289,14 @@ class Aggregator(Generic[T]):
 # Utility Functions
 # ============================================================
 
+@singledispatch
 def sum_monoid(monoid: Monoid[T], items: List[T]) -> T:
     """
     Convenience function to sum items using a monoid
 
+    Dispatches on the monoid type: sketch monoids register a bulk merge
+    (e.g. HLLMonoid -> fast_merge), everything else uses monoid.sum.
+
     Args:
         monoid: Monoid instance
         items: Items to sum
@@ -191,6 +307,84 @@ def sum_monoid(monoid: Monoid[T], items: List[T]) -> T:
     return monoid.sum(items)
 
 
+@sum_monoid.register
+def _sum_add(monoid: Add, items: List[T]) -> T:
+    """Plain numbers: builtin sum (ints) or math.fsum (floats) in one C loop"""
+    items = list(items)
+    if items:
+        first = type(items[0])
+        if first is int:
+            return builtins.sum(items)
+        if first is float:
+            return math.fsum(items)
+    return monoid.sum(items)
+
+
+@sum_monoid.register
+def _sum_max(monoid: Max, items: List[T]) -> T:
+    """Builtin max, zero() (-inf) for no items"""
+    return max(items, default=monoid.zero())
+
+
+@sum_monoid.register
+def _sum_min(monoid: Min, items: List[T]) -> T:
+    """Builtin min, zero() (+inf) for no items"""
+    return min(items, default=monoid.zero())
+
+
+def merge_map_numeric(op: str, maps: List[dict]) -> dict:
+    """
+    Merge dictionaries of numbers with a builtin operator instead of monoid.plus
+
+    Args:
+        op: "sum", "max" or "min"
+        maps: List of dictionaries to merge
+
+    Returns:
+        Merged dictionary
+    """
+    if op not in ("sum", "max", "min"):
+        raise ValueError(f"Unknown numeric merge op: {op}")
+
+    if not maps:
+        return {}
+
+    # Seed from a copy of the first map; only the rest need probing
+    result = dict(maps[0])
+    rest = maps[1:]
+    get = result.get
+    missing = object()
+    if op == "sum":
+        for m in rest:
+            for key, value in m.items():
+                current = get(key, missing)
+                result[key] = value if current is missing else current + value
+    elif op == "max":
+        for m in rest:
+            for key, value in m.items():
+                current = get(key, missing)
+                if current is missing or value > current:
+                    result[key] = value
+    else:
+        for m in rest:
+            for key, value in m.items():
+                current = get(key, missing)
+                if current is missing or value < current:
+                    result[key] = value
+    return result
+
+
+def _numeric_merge_op(monoid) -> Optional[str]:
+    """merge_map_numeric op equivalent to a numeric monoid, or None"""
+    if isinstance(monoid, Add):
+        return "sum"
+    if isinstance(monoid, Max):
+        return "max"
+    if isinstance(monoid, Min):
+        return "min"
+    return None
+
+
 def merge_map(monoid: Monoid[T], maps: List[dict]) -> dict:
     """
     Merge multiple dictionaries using monoid for value combination
@@ -202,11 +396,21 @@ def merge_map(monoid: Monoid[T], maps: List[dict]) -> dict:
     Returns:
         Merged dictionary
     """
-    result = {}
-    for m in maps:
+    op = _numeric_merge_op(monoid)
+    if op is not None:
+        return merge_map_numeric(op, maps)
+
+    if not maps:
+        return {}
+
+    # Seed from the first map (keeps left-to-right order for non-commutative
+    # monoids), then one dict.get probe per key with plus bound locally
+    result = dict(maps[0])
+    get = result.get
+    plus = monoid.plus
+    missing = object()
+    for m in maps[1:]:
         for key, value in m.items():
-            if key in result:
-                result[key] = monoid.plus(result[key], value)
-            else:
-                result[key] = value
+            current = get(key, missing)
+            result[key] = value if current is missing else plus(current, value)
     return result
@@ -9,9 +9,52 @@ Enables composable membership testing across:
 MIGRATION NOTE: This now uses algesnake's optimized Bloom Filter implementation
 with Pythonic operator overloading (+ operator for union).
 """
-from typing import List
+from typing import Iterable, List, Optional
+
+import numpy as np
+
 from app.core.monoid import Monoid, SemigroupLike
 from algesnake.approximate import BloomFilter
+from app.core.sketches.bloom_filter import BloomFilter as SketchBloomFilter
+
+
+def _bloom_params(bf: SketchBloomFilter) -> tuple:
+    """Parameters that must match for two filters' bits to be OR-able"""
+    return (bf.capacity, bf.error_rate, bf.bit_size, bf.hash_count)
+
+
+def _bitwise_union(filters: List[BloomFilter]) -> Optional[BloomFilter]:
+    """
+    OR the bit arrays of many filters into one preallocated buffer
+
+    Only the in-tree BloomFilter, whose bits are a word-padded bytearray, takes
+    this path. Compatibility is checked once for the whole list up front; the
+    merge itself is an in-place np.bitwise_or per input on uint64 words,
+    instead of one new, re-validated filter per pairwise union.
+
+    Args:
+        filters: Non-empty list of Bloom filters
+
+    Returns:
+        Union filter, or None if any filter is not an in-tree BloomFilter
+
+    Raises:
+        ValueError: If the filters have different parameters
+    """
+    if any(type(bf) is not SketchBloomFilter for bf in filters):
+        return None
+
+    first = filters[0]
+    params = _bloom_params(first)
+    if any(_bloom_params(bf) != params for bf in filters[1:]):
+        raise ValueError("Bloom filters must have same parameters for union")
+
+    result = SketchBloomFilter.from_bytes(first.bit_array, first.capacity, first.error_rate)
+    acc = np.frombuffer(result.bit_array, dtype=np.uint64)
+    bitwise_or = np.bitwise_or
+    for bf in filters[1:]:
+        bitwise_or(acc, np.frombuffer(bf.bit_array, dtype=np.uint64), out=acc)
+    return result
 
 
 class BloomFilterMonoid(SemigroupLike[BloomFilter]):
@@ -93,9 +136,12 @@ class BloomFilterMonoid(SemigroupLike[BloomFilter]):
             hourly_filters = [bf_00, bf_01, ..., bf_23]
             daily_filter = semigroup.sum_union(hourly_filters)
         """
-        result = self.sum_nonempty(filters)
-        if result is None:
+        if not filters:
             raise ValueError("Cannot union empty list of Bloom filters")
+
+        result = _bitwise_union(filters)
+        if result is None:
+            result = self.sum_nonempty(filters)
         return result
 
 
@@ -143,6 +189,25 @@ class BloomFilterUnionMonoid(Monoid[BloomFilter]):
         # Use algesnake's Pythonic + operator
         return a + b
 
+    def sum(self, items: Iterable[BloomFilter]) -> BloomFilter:
+        """
+        Union many filters with one vectorized OR pass
+
+        Args:
+            items: Bloom filters with this monoid's parameters
+
+        Returns:
+            Combined filter (zero() for no items)
+        """
+        items = list(items)
+        if not items:
+            return self.zero()
+
+        result = _bitwise_union(items)
+        if result is None:
+            return super().sum(items)
+        return result
+
     def sum_time_windows(self, filters: List[BloomFilter]) -> BloomFilter:
         """
         Merge filters from multiple time windows
@@ -181,8 +246,8 @@ class BloomFilterIntersectionMonoid(Monoid[BloomFilter]):
         For intersection, identity is the "everything" element
         """
         bf = BloomFilter(capacity=self.capacity, error_rate=self.error_rate)
-        # Set all bits to 1
-        bf.bit_array = bytearray([0xFF] * len(bf.bit_array))
+        # Set all bits to 1 (bytearray repeat is a C-level fill, no int list)
+        bf.bit_array = bytearray(b'\xff') * len(bf.bit_array)
         return bf
 
     def plus(self, a: BloomFilter, b: BloomFilter) -> BloomFilter:
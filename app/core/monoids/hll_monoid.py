@@ -9,10 +9,24 @@ Enables composable cardinality estimation across:
 MIGRATION NOTE: This now uses algesnake's optimized HyperLogLog implementation
 with Pythonic operator overloading (+ operator for merging).
 """
-from typing import List
-from app.core.monoid import Monoid
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from app.core.monoid import Monoid, sum_monoid
+from app.core.sketches.hyperloglog import HyperLogLog as RegisterHLL, hash_item
 from algesnake.approximate import HyperLogLog
 
+try:  # Optional: GPU merges for very large distributed batches
+    import cupy as cp
+except ImportError:
+    cp = None
+
+# GPU merges only pay off for wide sketches in large batches: below precision 16
+# or 64 sketches, host<->device copies cost more than the GPU saves
+GPU_MERGE_MIN_PRECISION = 16
+GPU_MERGE_MIN_SKETCHES = 64
+
 
 class HLLMonoid(Monoid[HyperLogLog]):
     """
@@ -75,8 +89,132 @@ class HLLMonoid(Monoid[HyperLogLog]):
                 f"Cannot merge HLLs with different precision: {a.precision} vs {b.precision}"
             )
 
-        # Use algesnake's Pythonic + operator for merging
-        return a + b
+        regs_a = getattr(a, "registers", None)
+        regs_b = getattr(b, "registers", None)
+        if regs_a is None or regs_b is None:
+            # Use algesnake's Pythonic + operator for merging
+            return a + b
+
+        arr_a = np.asarray(regs_a, dtype=np.uint8)
+        arr_b = np.asarray(regs_b, dtype=np.uint8)
+        # An all-zero side (e.g. a zero() seed) is the identity: copy, skip the max
+        if not arr_a.any():
+            return self._with_registers(arr_b.copy(), like=b)
+        if not arr_b.any():
+            return self._with_registers(arr_a.copy(), like=a)
+
+        return self._with_registers(np.maximum(arr_a, arr_b), like=a)
+
+    def _with_registers(self, merged: np.ndarray, like: HyperLogLog) -> HyperLogLog:
+        """
+        New HLL of the same class and precision as ``like`` holding ``merged``
+
+        The precision comes from the inputs, not the monoid: plus() only
+        requires its two operands to agree. The registers keep ``like``'s
+        container type (ndarray, bytearray or list), so views and serialization
+        on the result behave as on the inputs.
+        """
+        result = type(like)(precision=like.precision)
+        registers = like.registers
+        if isinstance(registers, np.ndarray):
+            result.registers = merged
+        elif isinstance(registers, bytearray):
+            result.registers = bytearray(merged.tobytes())
+        else:
+            result.registers = merged.tolist()
+        return result
+
+    def _checked_registers(self, hlls: List[HyperLogLog]) -> Optional[list]:
+        """
+        Validate precision and collect the register arrays of a merge batch
+
+        Args:
+            hlls: HLLs to merge
+
+        Returns:
+            Register arrays in input order, or None if any sketch does not
+            expose ``registers`` (callers then fall back to sum())
+
+        Raises:
+            ValueError: If an HLL has a different precision than this monoid
+        """
+        for hll in hlls:
+            if hll.precision != self.precision:
+                raise ValueError(
+                    f"Cannot merge HLLs with different precision: {self.precision} vs {hll.precision}"
+                )
+
+        registers = [getattr(hll, "registers", None) for hll in hlls]
+        if any(r is None for r in registers):
+            return None
+        return registers
+
+    def fast_merge(self, hlls: List[HyperLogLog]) -> HyperLogLog:
+        """
+        Merge many HLLs with a single register-wise max
+
+        Folds every register array into one uint8 accumulator with an
+        in-place np.maximum, instead of allocating a new sketch per pairwise
+        merge (or stacking all inputs into an N x m array). Sketches that do
+        not expose a ``registers`` array fall back to sum().
+
+        Args:
+            hlls: HLLs to merge (all with this monoid's precision)
+
+        Returns:
+            Merged HLL (union of all inputs)
+
+        Raises:
+            ValueError: If an HLL has a different precision
+        """
+        hlls = list(hlls)
+        if not hlls:
+            return self.zero()
+
+        registers = self._checked_registers(hlls)
+        if registers is None:
+            return self.sum(hlls)
+
+        merged = np.array(registers[0], dtype=np.uint8)
+        maximum = np.maximum
+        for r in registers[1:]:
+            maximum(merged, np.asarray(r, dtype=np.uint8), out=merged)
+
+        # Keep the sketch class and register container the inputs use
+        return self._with_registers(merged, like=hlls[0])
+
+    def merge_distributed_gpu(self, hlls: List[HyperLogLog]) -> HyperLogLog:
+        """
+        Merge a large batch of HLLs with a register-wise max on the GPU
+
+        Used only when CuPy is installed, the precision is at least
+        GPU_MERGE_MIN_PRECISION and the batch holds at least
+        GPU_MERGE_MIN_SKETCHES sketches; otherwise identical to fast_merge.
+
+        Args:
+            hlls: HLLs to merge (all with this monoid's precision)
+
+        Returns:
+            Merged HLL (union of all inputs)
+
+        Raises:
+            ValueError: If an HLL has a different precision
+        """
+        hlls = list(hlls)
+        if (
+            cp is None
+            or self.precision < GPU_MERGE_MIN_PRECISION
+            or len(hlls) < GPU_MERGE_MIN_SKETCHES
+        ):
+            return self.fast_merge(hlls)
+
+        registers = self._checked_registers(hlls)
+        if registers is None:
+            return self.sum(hlls)
+
+        stacked = cp.asarray(np.stack([np.asarray(r, dtype=np.uint8) for r in registers]))
+        merged = cp.max(stacked, axis=0).get()
+        return self._with_registers(merged, like=hlls[0])
 
     def sum_time_windows(self, hlls: List[HyperLogLog]) -> HyperLogLog:
         """
@@ -93,7 +231,7 @@ class HLLMonoid(Monoid[HyperLogLog]):
             hourly_hlls = [hll_00, hll_01, ..., hll_23]
             daily_hll = monoid.sum_time_windows(hourly_hlls)
         """
-        return self.sum(hlls)
+        return self.fast_merge(hlls)
 
     def sum_systems(self, hlls: List[HyperLogLog]) -> HyperLogLog:
         """
@@ -110,12 +248,15 @@ class HLLMonoid(Monoid[HyperLogLog]):
             system_hlls = [hll_prod, hll_staging, hll_api]
             total_hll = monoid.sum_systems(system_hlls)
         """
-        return self.sum(hlls)
+        return self.fast_merge(hlls)
 
     def merge_distributed(self, hlls: List[HyperLogLog]) -> HyperLogLog:
         """
         Merge HLLs from distributed workers
 
+        Large high-precision batches go to the GPU when CuPy is available
+        (see merge_distributed_gpu); everything else uses fast_merge.
+
         Args:
             hlls: List of HLLs from different workers
 
@@ -127,7 +268,50 @@ class HLLMonoid(Monoid[HyperLogLog]):
             worker_hlls = [worker1_hll, worker2_hll, worker3_hll]
             final_hll = monoid.merge_distributed(worker_hlls)
         """
-        return self.sum(hlls)
+        return self.merge_distributed_gpu(hlls)
+
+
+@sum_monoid.register
+def _sum_hll(monoid: HLLMonoid, items: List[HyperLogLog]) -> HyperLogLog:
+    """Sum HLLs with one register-wise max instead of pairwise plus()"""
+    return monoid.fast_merge(items)
+
+
+def build_hlls_batch(
+    precision: int, key_iterables: List[Iterable[Union[str, bytes]]]
+) -> List[RegisterHLL]:
+    """
+    Build one HLL per key iterable, hashing each distinct key only once
+
+    Keys shared between iterables (e.g. the same users seen by several
+    workers or systems) are hashed a single time with the sketch's own
+    hash_item, and each sketch takes its batch through _add_hashes. The
+    results are identical to calling add() per key, so they merge with any
+    other register-based HyperLogLog of the same precision.
+
+    Args:
+        precision: HLL precision for every sketch
+        key_iterables: One iterable of keys per sketch
+
+    Returns:
+        List of HLLs, in the same order as key_iterables
+    """
+    hashes = {}  # key -> 64-bit hash, shared across sketches
+    hlls = []
+
+    for keys in key_iterables:
+        batch = []
+        for key in keys:
+            h = hashes.get(key)
+            if h is None:
+                h = hashes[key] = hash_item(key)
+            batch.append(h)
+
+        hll = RegisterHLL(precision=precision)
+        hll._add_hashes(np.asarray(batch, dtype=np.uint64))
+        hlls.append(hll)
+
+    return hlls
 
 
 class HLLMonoidWithTimestamp(Monoid[tuple]):
@@ -159,6 +343,26 @@ class HLLMonoidWithTimestamp(Monoid[tuple]):
         hll_b, ts_b = b
 
         merged_hll = self.hll_monoid.plus(hll_a, hll_b)
-        max_ts = max(ts_a, ts_b)
+        max_ts = ts_a if ts_a > ts_b else ts_b
 
         return (merged_hll, max_ts)
+
+    def sum(self, items: Iterable[tuple]) -> tuple:
+        """
+        Merge many (HLL, timestamp) pairs
+
+        Splits the pairs once, merges all HLLs with a single fast_merge and
+        takes one max() over the timestamps.
+
+        Args:
+            items: (HLL, timestamp) pairs
+
+        Returns:
+            (merged HLL, latest timestamp); zero() for no items
+        """
+        items = list(items)
+        if not items:
+            return self.zero()
+
+        hlls, timestamps = zip(*items)
+        return (self.hll_monoid.fast_merge(hlls), max(timestamps))
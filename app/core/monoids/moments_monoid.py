@@ -5,7 +5,11 @@ Inspired by Twitter Algebird's Moments
 Tracks mean, variance, skewness, kurtosis in O(1) space
 """
 import math
-from typing import NamedTuple
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
 from app.core.monoid import Monoid
 
 
@@ -63,6 +67,58 @@ class Moments(NamedTuple):
         return (self.m4 * self.m0) / (self.m2 ** 2) - 3.0  # Excess kurtosis
 
 
+# Packed record layout for storing many Moments in one contiguous array
+MOMENTS_DTYPE = np.dtype([
+    ('m0', np.int64),
+    ('m1', np.float64),
+    ('m2', np.float64),
+    ('m3', np.float64),
+    ('m4', np.float64),
+])
+
+
+def moments_to_record(m: Moments) -> np.void:
+    """Pack Moments into a single MOMENTS_DTYPE record"""
+    return np.array(tuple(m), dtype=MOMENTS_DTYPE)[()]
+
+
+def record_to_moments(r: np.void) -> Moments:
+    """Unpack a MOMENTS_DTYPE record into Moments"""
+    return Moments(
+        m0=int(r['m0']),
+        m1=float(r['m1']),
+        m2=float(r['m2']),
+        m3=float(r['m3']),
+        m4=float(r['m4']),
+    )
+
+
+@lru_cache(maxsize=256)
+def _moments_coeffs(n_a: int, n_b: int) -> tuple:
+    """
+    Count-only coefficients of the parallel moments merge
+
+    They depend on (n_a, n_b) alone, so repeated merges of equally sized
+    windows (e.g. fixed-rate hourly buckets rolled into a day) reuse them.
+
+    Returns:
+        (n, w_a, w_b, c2, c3, c3d, c4, c4d2, c4d)
+    """
+    n = n_a + n_b
+    n_ab = n_a * n_b
+    return (
+        n,
+        n_a / n,
+        n_b / n,
+        n_ab / n,
+        n_ab * (n_a - n_b) / (n * n),
+        3.0 / n,
+        n_ab * (n_a * n_a - n_ab + n_b * n_b) / (n * n * n),
+        6.0 / (n * n),
+        4.0 / n,
+    )
+
+
 class MomentsMonoid(Monoid[Moments]):
     """
     Monoid for statistical moments
@@ -117,7 +173,7 @@ class MomentsMonoid(Monoid[Moments]):
             return a
 
         n_a, n_b = a.m0, b.m0
-        n = n_a + n_b
+        n, w_a, w_b, c2, c3, c3d, c4, c4d2, c4d = _moments_coeffs(n_a, n_b)
 
         delta = b.m1 - a.m1
         delta2 = delta * delta
@@ -125,24 +181,24 @@ class MomentsMonoid(Monoid[Moments]):
         delta4 = delta2 * delta2
 
         # Combined mean
-        m1 = (n_a * a.m1 + n_b * b.m1) / n
+        m1 = w_a * a.m1 + w_b * b.m1
 
         # Combined variance
-        m2 = a.m2 + b.m2 + delta2 * n_a * n_b / n
+        m2 = a.m2 + b.m2 + delta2 * c2
 
         # Combined skewness
         m3 = (
             a.m3 + b.m3 +
-            delta3 * n_a * n_b * (n_a - n_b) / (n * n) +
-            3.0 * delta * (n_a * b.m2 - n_b * a.m2) / n
+            delta3 * c3 +
+            c3d * delta * (n_a * b.m2 - n_b * a.m2)
         )
 
         # Combined kurtosis
         m4 = (
             a.m4 + b.m4 +
-            delta4 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b) / (n * n * n) +
-            6.0 * delta2 * (n_a * n_a * b.m2 + n_b * n_b * a.m2) / (n * n) +
-            4.0 * delta * (n_a * b.m3 - n_b * a.m3) / n
+            delta4 * c4 +
+            c4d2 * delta2 * (n_a * n_a * b.m2 + n_b * n_b * a.m2) +
+            c4d * delta * (n_a * b.m3 - n_b * a.m3)
         )
 
         return Moments(m0=n, m1=m1, m2=m2, m3=m3, m4=m4)
@@ -175,8 +231,40 @@ class MomentsMonoid(Monoid[Moments]):
             print(m.mean)  # 3.0
             print(m.variance)  # 2.5
         """
-        moments_list = [self.from_value(v) for v in values]
-        return self.sum(moments_list)
+        x = np.asarray(values, dtype=np.float64).ravel()
+        if x.size == 0:
+            return self.zero()
+
+        # Exact central moments over the whole array (two passes, no per-value Moments)
+        mean = x.mean()
+        d = x - mean
+        d2 = d * d
+        return Moments(
+            m0=int(x.size),
+            m1=float(mean),
+            m2=float(d2.sum()),
+            m3=float((d2 * d).sum()),
+            m4=float((d2 * d2).sum()),
+        )
+
+    def from_windows(self, windows: Iterable) -> Moments:
+        """
+        Statistics over several windows of raw values in one pass
+
+        Equivalent to sum_time_windows([from_values(w) for w in windows]),
+        but concatenates the raw values and reduces them once, without
+        building or merging per-window Moments.
+
+        Args:
+            windows: Iterable of value sequences (lists or arrays), one per window
+
+        Returns:
+            Moments computed over all values of all windows
+        """
+        arrays = [np.asarray(w, dtype=np.float64).ravel() for w in windows]
+        if not arrays:
+            return self.zero()
+        return self.from_values(np.concatenate(arrays))
 
     def sum_time_windows(self, moments_list: list) -> Moments:
         """
@@ -197,6 +285,152 @@ class MomentsMonoid(Monoid[Moments]):
         return self.sum(moments_list)
 
 
+class MomentsArray:
+    """
+    Many Moments stored column-wise (structure of arrays)
+
+    Holds m0..m4 as five parallel float64 arrays, one row per series (key,
+    window, ...), so whole groups merge with element-wise NumPy ops instead
+    of one MomentsMonoid.plus call per pair. Use MomentsMonoid.plus for
+    single merges and this for bulk groupby-style aggregation.
+
+    Example usage:
+        a = MomentsArray.from_moments([m_prod_00, m_api_00])
+        b = MomentsArray.from_moments([m_prod_01, m_api_01])
+        merged = a.merge(b)
+        merged.to_moments(0)  # prod across both hours
+    """
+
+    __slots__ = ("m0", "m1", "m2", "m3", "m4")
+
+    def __init__(self, m0, m1, m2, m3, m4):
+        """
+        Initialize from five equally sized columns
+
+        Args:
+            m0: Counts
+            m1: Means
+            m2: Unnormalized variances
+            m3: Unnormalized skewness
+            m4: Unnormalized kurtosis
+        """
+        self.m0 = np.asarray(m0, dtype=np.float64)
+        self.m1 = np.asarray(m1, dtype=np.float64)
+        self.m2 = np.asarray(m2, dtype=np.float64)
+        self.m3 = np.asarray(m3, dtype=np.float64)
+        self.m4 = np.asarray(m4, dtype=np.float64)
+
+    @classmethod
+    def zeros(cls, n: int) -> 'MomentsArray':
+        """n empty rows (the Moments identity)"""
+        return cls(*(np.zeros(n) for _ in range(5)))
+
+    @classmethod
+    def from_moments(cls, moments_list: list) -> 'MomentsArray':
+        """
+        Build columns from a list of Moments
+
+        Args:
+            moments_list: Moments, one per row
+
+        Returns:
+            MomentsArray with len(moments_list) rows
+        """
+        table = np.array(moments_list, dtype=np.float64).reshape(-1, 5)
+        return cls(*table.T)
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> 'MomentsArray':
+        """
+        Build columns from a MOMENTS_DTYPE structured array
+
+        Args:
+            records: Array with dtype MOMENTS_DTYPE
+
+        Returns:
+            MomentsArray with one row per record
+        """
+        return cls(*(records[name] for name in MOMENTS_DTYPE.names))
+
+    def to_records(self) -> np.ndarray:
+        """
+        Pack rows into a MOMENTS_DTYPE structured array
+
+        Returns:
+            Structured array, one record per row
+        """
+        records = np.empty(len(self), dtype=MOMENTS_DTYPE)
+        for name in MOMENTS_DTYPE.names:
+            records[name] = getattr(self, name)
+        return records
+
+    def __len__(self) -> int:
+        return len(self.m0)
+
+    def merge(self, other: 'MomentsArray') -> 'MomentsArray':
+        """
+        Row-wise merge with another MomentsArray
+
+        Same parallel formula as MomentsMonoid.plus, evaluated over all rows
+        at once. Empty rows (count 0) act as the identity.
+
+        Args:
+            other: MomentsArray with the same number of rows
+
+        Returns:
+            New MomentsArray of merged rows
+
+        Raises:
+            ValueError: If the row counts differ
+        """
+        if len(self) != len(other):
+            raise ValueError(f"Cannot merge MomentsArray of {len(self)} and {len(other)} rows")
+
+        n_a, n_b = self.m0, other.m0
+        n = n_a + n_b
+        # Rows where both sides are empty stay all-zero
+        n_safe = np.where(n == 0, 1.0, n)
+
+        delta = other.m1 - self.m1
+        delta2 = delta * delta
+        delta3 = delta * delta2
+        delta4 = delta2 * delta2
+        n_ab = n_a * n_b
+
+        m1 = (n_a * self.m1 + n_b * other.m1) / n_safe
+        m2 = self.m2 + other.m2 + delta2 * n_ab / n_safe
+        m3 = (
+            self.m3 + other.m3 +
+            delta3 * n_ab * (n_a - n_b) / (n_safe * n_safe) +
+            3.0 * delta * (n_a * other.m2 - n_b * self.m2) / n_safe
+        )
+        m4 = (
+            self.m4 + other.m4 +
+            delta4 * n_ab * (n_a * n_a - n_ab + n_b * n_b) / (n_safe * n_safe * n_safe) +
+            6.0 * delta2 * (n_a * n_a * other.m2 + n_b * n_b * self.m2) / (n_safe * n_safe) +
+            4.0 * delta * (n_a * other.m3 - n_b * self.m3) / n_safe
+        )
+        return MomentsArray(n, m1, m2, m3, m4)
+
+    def to_moments(self, i: int) -> Moments:
+        """
+        Extract one row as Moments
+
+        Args:
+            i: Row index
+
+        Returns:
+            Moments for that row
+        """
+        return Moments(
+            m0=int(self.m0[i]),
+            m1=float(self.m1[i]),
+            m2=float(self.m2[i]),
+            m3=float(self.m3[i]),
+            m4=float(self.m4[i]),
+        )
+
+
 class RunningStatistics:
     """
     Mutable wrapper around MomentsMonoid for incremental updates
@@ -206,17 +440,45 @@ class RunningStatistics:
 
     def __init__(self):
         self.monoid = MomentsMonoid()
-        self.moments = self.monoid.zero()
+        # Moments fields kept as plain numbers; the NamedTuple is built on read
+        self._m0 = 0
+        self._m1 = 0.0
+        self._m2 = 0.0
+        self._m3 = 0.0
+        self._m4 = 0.0
+
+    @property
+    def moments(self) -> Moments:
+        """Current Moments"""
+        return Moments(self._m0, self._m1, self._m2, self._m3, self._m4)
+
+    @moments.setter
+    def moments(self, value: Moments) -> None:
+        self._m0, self._m1, self._m2, self._m3, self._m4 = value
 
     def add(self, value: float) -> None:
-        """Add a single value"""
-        new_moment = self.monoid.from_value(value)
-        self.moments = self.monoid.plus(self.moments, new_moment)
+        """
+        Add a single value
+
+        Online (Welford/Terriberry) update of the four central moments, with
+        no intermediate Moments allocated.
+        """
+        self._m0 += 1
+        n = self._m0
+        delta = value - self._m1
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * (n - 1)
+        m2, m3 = self._m2, self._m3
+
+        self._m1 += delta_n
+        self._m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * m2 - 4 * delta_n * m3
+        self._m3 = m3 + term1 * delta_n * (n - 2) - 3 * delta_n * m2
+        self._m2 = m2 + term1
 
     def add_all(self, values: list) -> None:
         """Add multiple values"""
-        for value in values:
-            self.add(value)
+        self.moments = self.monoid.plus(self.moments, self.monoid.from_values(values))
 
     def merge(self, other: 'RunningStatistics') -> None:
         """Merge with another RunningStatistics"""
@@ -3,21 +3,84 @@ Event processing engine
 Handles incoming events and updates probabilistic data structures
 """
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Tuple
 import logging
 
 from app.models.events import Event
 from app.core.storage import RedisStorage
-from app.utils.time_windows import TimeWindow
+from app.utils.time_windows import TimeWindow, TimeWindowBucketer
 
 logger = logging.getLogger(__name__)
 
 
+def _user_id(event: Event) -> Optional[str]:
+    return event.user_id or None
+
+
+def _session_id(event: Event) -> Optional[str]:
+    return event.session_id or None
+
+
+def _ip(event: Event) -> Optional[str]:
+    return event.metadata.get("ip")
+
+
+def _endpoint(event: Event) -> Optional[str]:
+    return event.metadata.get("endpoint")
+
+
+def _event_type(event: Event) -> str:
+    # The enum's interned value, not the member: pickled TopK keys stay plain strings
+    return event.event_type.value
+
+
+def _user_activity(event: Event) -> Optional[str]:
+    # Bloom key member for "did user X access system Y?" queries
+    return f"{event.user_id}:{event.system}" if event.user_id else None
+
+
+def _failed_login_ip(event: Event) -> Optional[str]:
+    # Error codes on security events are tracked by source IP
+    if event.event_type == "security_event" and "status_code" in event.metadata:
+        return event.metadata.get("ip", "unknown")
+    return None
+
+
 class EventProcessor:
     """
     Process events and update probabilistic data structures
     """
 
+    # Metrics summary layout: (section, field, metric, window[, k]), all read in one pipeline
+    SUMMARY_HLLS = [
+        ("hourly", "unique_users", "users", TimeWindow.HOUR),
+        ("hourly", "unique_sessions", "sessions", TimeWindow.HOUR),
+        ("hourly", "unique_ips", "ips", TimeWindow.HOUR),
+        ("daily", "unique_users", "users", TimeWindow.DAY),
+        ("daily", "unique_sessions", "sessions", TimeWindow.DAY),
+        ("daily", "unique_ips", "ips", TimeWindow.DAY),
+    ]
+    SUMMARY_TOPKS = [
+        ("hourly", "top_users", "active_users", TimeWindow.HOUR, 10),
+        ("hourly", "top_ips", "active_ips", TimeWindow.HOUR, 10),
+    ]
+
+    # Sketch updates per event: (kind, metric, value extractor, windows). An
+    # extractor returning None skips that row. HLL rows take every window in
+    # one update, Bloom and TopK rows emit one update per window
+    UPDATE_PLAN = (
+        ("hll", "users", _user_id, (TimeWindow.HOUR, TimeWindow.DAY, TimeWindow.WEEK)),
+        ("hll", "sessions", _session_id, (TimeWindow.HOUR, TimeWindow.DAY)),
+        ("hll", "ips", _ip, (TimeWindow.HOUR, TimeWindow.DAY)),
+        ("bloom", "user_activity", _user_activity, (TimeWindow.DAY, TimeWindow.WEEK)),
+        ("bloom", "ip_activity", _ip, (TimeWindow.DAY,)),
+        ("topk", "active_users", _user_id, (TimeWindow.HOUR,)),
+        ("topk", "active_ips", _ip, (TimeWindow.HOUR,)),
+        ("topk", "event_types", _event_type, (TimeWindow.HOUR,)),
+        ("topk", "endpoints", _endpoint, (TimeWindow.HOUR,)),
+        ("topk", "failed_logins", _failed_login_ip, (TimeWindow.HOUR,)),
+    )
+
     def __init__(self, storage: RedisStorage):
         """
         Initialize event processor
@@ -34,195 +97,102 @@ class EventProcessor:
         Args:
             event: Event to process
         """
-        try:
-            # Update HyperLogLog for distinct counts
-            self._update_hll(event)
-
-            # Update Bloom filter for activity tracking
-            self._update_bloom(event)
-
-            # Update TopK for heavy hitters
-            self._update_topk(event)
-
-            # Publish to real-time stream
-            self._publish_event(event)
-
-            logger.debug(f"Processed event: {event.event_type} for system {event.system}")
+        # HLL, Bloom and TopK updates plus the stream publish, in two
+        # pipelined round-trips instead of one per command. Errors propagate
+        # to the caller, which logs them (the API handler does, with traceback)
+        hour = TimeWindowBucketer.floor_to_hour(event.timestamp)
+        hll, bloom, topk = self._sketch_updates(event, hour)
+        self.storage.apply_updates(hll, bloom, topk, [self._event_message(event)])
 
-        except Exception as e:
-            logger.error(f"Error processing event: {e}", exc_info=True)
-            raise
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processed event: %s for system %s", event.event_type, event.system)
 
     def process_batch(self, events: List[Event]) -> int:
         """
         Process multiple events
 
+        Events that fail to build their updates are logged and skipped. The
+        rest are written together in one apply_updates call, so storage is
+        all-or-nothing from the caller's view: if that call fails, the error is
+        logged and the batch counts as 0 processed. The pipelines are not
+        transactional, so some of the batch's writes may still have landed.
+
         Args:
             events: List of events
 
         Returns:
-            Number of successfully processed events
+            Number of events whose updates were written
         """
-        success_count = 0
+        hll_updates, bloom_updates, topk_updates, messages = [], [], [], []
+        floor_to_hour = TimeWindowBucketer.floor_to_hour
         for event in events:
             try:
-                self.process_event(event)
-                success_count += 1
+                # Every tracked window is hourly or coarser, so events in the same
+                # hour share a timestamp and storage formats each key only once
+                hour = floor_to_hour(event.timestamp)
+                event_hll, event_bloom, event_topk = self._sketch_updates(event, hour)
+                message = self._event_message(event)
             except Exception as e:
                 logger.error(f"Failed to process event: {e}")
+                continue
+            hll_updates.extend(event_hll)
+            bloom_updates.extend(event_bloom)
+            topk_updates.extend(event_topk)
+            messages.append(message)
 
-        return success_count
-
-    def _update_hll(self, event: Event) -> None:
-        """
-        Update HyperLogLog sketches for distinct counting
-
-        Tracks:
-        - Unique users per system
-        - Unique sessions per system
-        - Unique IPs per event type
-        """
-        # Track unique users
-        if event.user_id:
-            self.storage.add_to_hll(
-                metric="users",
-                system=event.system,
-                value=event.user_id,
-                timestamp=event.timestamp,
-                windows=[TimeWindow.HOUR, TimeWindow.DAY, TimeWindow.WEEK],
-            )
-
-        # Track unique sessions
-        if event.session_id:
-            self.storage.add_to_hll(
-                metric="sessions",
-                system=event.system,
-                value=event.session_id,
-                timestamp=event.timestamp,
-                windows=[TimeWindow.HOUR, TimeWindow.DAY],
-            )
-
-        # Track unique IPs
-        if "ip" in event.metadata:
-            self.storage.add_to_hll(
-                metric="ips",
-                system=event.system,
-                value=event.metadata["ip"],
-                timestamp=event.timestamp,
-                windows=[TimeWindow.HOUR, TimeWindow.DAY],
-            )
-
-    def _update_bloom(self, event: Event) -> None:
-        """
-        Update Bloom filters for activity tracking
+        if not messages:
+            return 0
 
-        Tracks:
-        - User activity per system (for "did user X access system Y?" queries)
-        - IP activity per system
-        """
-        # Track user activity
-        if event.user_id:
-            self.storage.add_to_bloom(
-                metric="user_activity",
-                system=event.system,
-                value=f"{event.user_id}:{event.system}",
-                timestamp=event.timestamp,
-                window=TimeWindow.DAY,
-            )
-
-            # Also track weekly for longer-term queries
-            self.storage.add_to_bloom(
-                metric="user_activity",
-                system=event.system,
-                value=f"{event.user_id}:{event.system}",
-                timestamp=event.timestamp,
-                window=TimeWindow.WEEK,
-            )
-
-        # Track IP activity for security monitoring
-        if "ip" in event.metadata:
-            self.storage.add_to_bloom(
-                metric="ip_activity",
-                system=event.system,
-                value=event.metadata["ip"],
-                timestamp=event.timestamp,
-                window=TimeWindow.DAY,
-            )
-
-    def _update_topk(self, event: Event) -> None:
-        """
-        Update TopK for heavy hitters
+        # Apply the whole batch at once: one PFADD per HLL key, one load/save
+        # per Bloom filter and TopK key, and every publish, in two round-trips
+        try:
+            self.storage.apply_updates(hll_updates, bloom_updates, topk_updates, messages)
+        except Exception:
+            logger.exception("Failed to store batch of %d events", len(messages))
+            return 0
 
-        Tracks:
-        - Most active users
-        - Most active IPs
-        - Most common event types
-        - Most accessed endpoints (if in metadata)
-        """
-        # Track most active users
-        if event.user_id:
-            self.storage.add_to_topk(
-                metric="active_users",
-                system=event.system,
-                value=event.user_id,
-                timestamp=event.timestamp,
-                window=TimeWindow.HOUR,
-            )
-
-        # Track most active IPs
-        if "ip" in event.metadata:
-            self.storage.add_to_topk(
-                metric="active_ips",
-                system=event.system,
-                value=event.metadata["ip"],
-                timestamp=event.timestamp,
-                window=TimeWindow.HOUR,
-            )
-
-        # Track event types
-        self.storage.add_to_topk(
-            metric="event_types",
-            system=event.system,
-            value=event.event_type,
-            timestamp=event.timestamp,
-            window=TimeWindow.HOUR,
-        )
+        return len(messages)
 
-        # Track endpoints if available
-        if "endpoint" in event.metadata:
-            self.storage.add_to_topk(
-                metric="endpoints",
-                system=event.system,
-                value=event.metadata["endpoint"],
-                timestamp=event.timestamp,
-                window=TimeWindow.HOUR,
-            )
-
-        # Track error codes for security events
-        if event.event_type == "security_event" and "status_code" in event.metadata:
-            self.storage.add_to_topk(
-                metric="failed_logins",
-                system=event.system,
-                value=event.metadata.get("ip", "unknown"),
-                timestamp=event.timestamp,
-                window=TimeWindow.HOUR,
-            )
-
-    def _publish_event(self, event: Event) -> None:
+    def _sketch_updates(self, event: Event, timestamp: datetime) -> Tuple[list, list, list]:
         """
-        Publish event to real-time stream for SSE
+        HLL, Bloom and TopK updates for an event, built from UPDATE_PLAN in one pass
 
         Args:
-            event: Event to publish
+            event: Event to process
+            timestamp: Event timestamp floored to the hour
+
+        Returns:
+            (hll_updates, bloom_updates, topk_updates) in the tuple layouts
+            RedisStorage.apply_updates expects
+        """
+        hll, bloom, topk = [], [], []
+        system = event.system
+        for kind, metric, extract, windows in self.UPDATE_PLAN:
+            value = extract(event)
+            if value is None:
+                continue
+            if kind == "hll":
+                hll.append((metric, system, value, timestamp, windows))
+            else:
+                target = bloom if kind == "bloom" else topk
+                for window in windows:
+                    target.append((metric, system, value, timestamp, window))
+        return hll, bloom, topk
+
+    def _event_message(self, event: Event) -> dict:
+        """
+        Stream payload for an event
+
+        The timestamp stays a datetime: orjson writes it as the same ISO 8601
+        string isoformat() would, during the single serialization at publish.
         """
-        event_dict = {
+        return {
             "event_type": event.event_type,
             "system": event.system,
             "user_id": event.user_id,
-            "timestamp": event.timestamp.isoformat(),
+            "timestamp": event.timestamp,
             "metadata": event.metadata,
         }
-        self.storage.publish_event(event_dict)
 
     def get_metrics_summary(self, system: str, timestamp: Optional[datetime] = None) -> dict:
         """
@@ -237,35 +207,17 @@ class EventProcessor:
         """
         timestamp = timestamp or datetime.utcnow()
 
-        return {
-            "system": system,
-            "timestamp": timestamp.isoformat(),
-            "hourly": {
-                "unique_users": self.storage.get_hll_cardinality(
-                    "users", system, TimeWindow.HOUR, timestamp
-                ),
-                "unique_sessions": self.storage.get_hll_cardinality(
-                    "sessions", system, TimeWindow.HOUR, timestamp
-                ),
-                "unique_ips": self.storage.get_hll_cardinality(
-                    "ips", system, TimeWindow.HOUR, timestamp
-                ),
-                "top_users": self.storage.get_topk(
-                    "active_users", system, k=10, timestamp=timestamp, window=TimeWindow.HOUR
-                ),
-                "top_ips": self.storage.get_topk(
-                    "active_ips", system, k=10, timestamp=timestamp, window=TimeWindow.HOUR
-                ),
-            },
-            "daily": {
-                "unique_users": self.storage.get_hll_cardinality(
-                    "users", system, TimeWindow.DAY, timestamp
-                ),
-                "unique_sessions": self.storage.get_hll_cardinality(
-                    "sessions", system, TimeWindow.DAY, timestamp
-                ),
-                "unique_ips": self.storage.get_hll_cardinality(
-                    "ips", system, TimeWindow.DAY, timestamp
-                ),
-            },
-        }
+        counts, topks = self.storage.get_summary_reads(
+            system,
+            timestamp,
+            hll_queries=[(metric, window) for _, _, metric, window in self.SUMMARY_HLLS],
+            topk_queries=[(metric, window, k) for _, _, metric, window, k in self.SUMMARY_TOPKS],
+        )
+
+        summary = {"system": system, "timestamp": timestamp.isoformat(), "hourly": {}, "daily": {}}
+        for (section, field, _, _), count in zip(self.SUMMARY_HLLS, counts):
+            summary[section][field] = count
+        for (section, field, _, _, _), items in zip(self.SUMMARY_TOPKS, topks):
+            summary[section][field] = items
+
+        return summary
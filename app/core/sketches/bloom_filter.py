@@ -2,9 +2,27 @@
 Bloom Filter implementation for set membership queries
 Fast probabilistic "has this been seen before?" checks
 """
-import mmh3
 import math
-from typing import Union
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+import xxhash
+
+_MASK64 = (1 << 64) - 1
+
+# Explicit little-endian words so bit p is word p >> 6, bit p & 63 on any host
+_WORD_DTYPE = np.dtype('<u8')
+
+# Hardware popcount over uint64 words (NumPy >= 2.0)
+_HAS_BITWISE_COUNT = hasattr(np, "bitwise_count")
+
+
+def _hash_pair(item: Union[str, bytes]) -> Tuple[int, int]:
+    """Split an item's 128-bit xxh3 hash into its (low, high) 64-bit halves"""
+    if isinstance(item, str):
+        item = item.encode('utf-8')
+    h = xxhash.xxh3_128_intdigest(item)
+    return h & _MASK64, h >> 64
 
 
 class BloomFilter:
@@ -26,6 +44,14 @@ class BloomFilter:
             capacity: Expected number of items
             error_rate: Desired false positive rate (0.001 = 0.1%)
         """
+        self._configure(capacity, error_rate)
+
+        # Initialize bit array, padded to whole 64-bit words
+        self.bit_array = bytearray(self._byte_size)
+        self._set_bit_count = 0
+
+    def _configure(self, capacity: int, error_rate: float) -> None:
+        """Set capacity, error rate and the derived bit size and hash count"""
         self.capacity = capacity
         self.error_rate = error_rate
 
@@ -33,8 +59,30 @@ class BloomFilter:
         self.bit_size = self._optimal_bit_size(capacity, error_rate)
         self.hash_count = self._optimal_hash_count(self.bit_size, capacity)
 
-        # Initialize bit array
-        self.bit_array = bytearray(math.ceil(self.bit_size / 8))
+        # k and m are fixed per filter: build the vectorized-path constants once
+        self._k_idx = np.arange(self.hash_count, dtype=np.uint64)
+        self._mod = np.uint64(self.bit_size)
+
+    @property
+    def _byte_size(self) -> int:
+        """Length of bit_array: bit_size rounded up to whole 64-bit words"""
+        return math.ceil(self.bit_size / 64) * 8
+
+    @property
+    def bit_array(self) -> bytearray:
+        """Filter bits, padded to whole 64-bit words"""
+        return self._bit_array
+
+    @bit_array.setter
+    def bit_array(self, value: bytearray) -> None:
+        self._bit_array = value
+        # Unknown until the next _set_bits() call counts it
+        self._set_bit_count: Optional[int] = None
+
+    @property
+    def _words(self) -> np.ndarray:
+        """Writable uint64 view sharing memory with bit_array"""
+        return np.frombuffer(self.bit_array, dtype=_WORD_DTYPE)
 
     @staticmethod
     def _optimal_bit_size(n: int, p: float) -> int:
@@ -56,7 +104,13 @@ class BloomFilter:
 
     def _get_positions(self, item: Union[str, bytes]) -> list:
         """
-        Get bit positions for an item using multiple hash functions
+        Get bit positions for an item using double hashing
+
+        A single 128-bit xxh3 hash is split into two 64-bit halves h1, h2 and
+        the k positions are derived as (h1 + i*h2) % m (Kirsch-Mitzenmacher),
+        instead of running k independently seeded hashes. Both halves are
+        reduced mod m once and the progression is walked by addition, so the
+        loop never builds >64-bit products or takes a modulo per position.
 
         Args:
             item: Item to hash
@@ -64,15 +118,29 @@ class BloomFilter:
         Returns:
             List of bit positions
         """
-        if isinstance(item, str):
-            item = item.encode('utf-8')
+        return self._positions_from_hash(*_hash_pair(item))
 
-        positions = []
-        for seed in range(self.hash_count):
-            hash_value = mmh3.hash(item, seed=seed, signed=False)
-            position = hash_value % self.bit_size
-            positions.append(position)
+    def _positions_from_hash(self, h1: int, h2: int) -> list:
+        """
+        Bit positions for this filter's size and hash count from a hash pair
+
+        Args:
+            h1: Low 64 bits of the item's 128-bit hash
+            h2: High 64 bits of the item's 128-bit hash
 
+        Returns:
+            List of bit positions
+        """
+        bit_size = self.bit_size
+        position = h1 % bit_size
+        step = h2 % bit_size
+
+        positions = [position]
+        for _ in range(self.hash_count - 1):
+            position += step
+            if position >= bit_size:
+                position -= bit_size
+            positions.append(position)
         return positions
 
     def add(self, item: Union[str, bytes]) -> None:
@@ -82,10 +150,31 @@ class BloomFilter:
         Args:
             item: String or bytes to add
         """
-        for position in self._get_positions(item):
+        self.add_positions(self._get_positions(item))
+
+    def add_positions(self, positions: Iterable[int]) -> None:
+        """
+        Set precomputed bit positions
+
+        Positions depend only on the item, bit_size and hash_count, so one
+        _get_positions() result can be applied to several filters built with
+        the same parameters (e.g. the daily and weekly filter of a metric).
+
+        Args:
+            positions: Bit positions from _get_positions
+        """
+        bit_array = self._bit_array
+        newly_set = 0
+        for position in positions:
             byte_index = position // 8
-            bit_index = position % 8
-            self.bit_array[byte_index] |= (1 << bit_index)
+            mask = 1 << (position % 8)
+            byte = bit_array[byte_index]
+            if not byte & mask:
+                bit_array[byte_index] = byte | mask
+                newly_set += 1
+        # Keep the set-bit count current so fill ratio and count never rescan
+        if self._set_bit_count is not None:
+            self._set_bit_count += newly_set
 
     def contains(self, item: Union[str, bytes]) -> bool:
         """
@@ -98,21 +187,74 @@ class BloomFilter:
             True: Item might be in set (or false positive)
             False: Item definitely NOT in set
         """
-        for position in self._get_positions(item):
-            byte_index = position // 8
-            bit_index = position % 8
-            if not (self.bit_array[byte_index] & (1 << bit_index)):
+        return self.contains_with_hash(*_hash_pair(item))
+
+    def contains_with_hash(self, h1: int, h2: int) -> bool:
+        """
+        Membership check from a precomputed hash pair
+
+        Lets callers that probe several filters (ScalableBloomFilter) hash the
+        item once; positions still follow each filter's own size and k.
+
+        Args:
+            h1: Low 64 bits of the item's 128-bit hash
+            h2: High 64 bits of the item's 128-bit hash
+
+        Returns:
+            Same result as contains() for the hashed item
+        """
+        bit_array = self._bit_array
+        for position in self._positions_from_hash(h1, h2):
+            if not (bit_array[position // 8] & (1 << (position % 8))):
                 return False
         return True
 
+    def contains_many(self, items: Iterable[Union[str, bytes]]) -> np.ndarray:
+        """
+        Check many items at once
+
+        Each item is hashed once; the (N, k) position matrix is derived with
+        the same double hashing as _get_positions in NumPy, and every bit is
+        tested with vectorized uint64 word loads, shifts and ANDs.
+
+        Args:
+            items: Strings or bytes to check
+
+        Returns:
+            Boolean array, one entry per item (same semantics as contains)
+        """
+        pairs = np.array([_hash_pair(item) for item in items], dtype=np.uint64).reshape(-1, 2)
+        h1 = pairs[:, 0] % self._mod
+        h2 = pairs[:, 1] % self._mod
+        # Both halves are already < m, so h1 + i*h2 cannot overflow uint64
+        positions = (h1[:, None] + self._k_idx[None, :] * h2[:, None]) % self._mod
+        words = self._words[positions >> np.uint64(6)]
+        bits = (words >> (positions & np.uint64(63))) & np.uint64(1)
+        return bits.all(axis=1)
+
     def __contains__(self, item: Union[str, bytes]) -> bool:
         """Support 'in' operator"""
         return self.contains(item)
 
+    def _set_bits(self) -> int:
+        """
+        Number of set bits in the bit array
+
+        add() maintains the count incrementally; a full popcount only runs when
+        the bits were replaced wholesale (from_bytes, union, intersection).
+        That uses np.bitwise_count on the uint64 words where available; older
+        NumPy falls back to int.bit_count over the whole array as one integer.
+        """
+        if self._set_bit_count is None:
+            if _HAS_BITWISE_COUNT:
+                self._set_bit_count = int(np.bitwise_count(self._words).sum(dtype=np.int64))
+            else:
+                self._set_bit_count = int.from_bytes(self.bit_array, 'little').bit_count()
+        return self._set_bit_count
+
     def estimated_fill_ratio(self) -> float:
         """Calculate estimated fill ratio of bit array"""
-        set_bits = sum(bin(byte).count('1') for byte in self.bit_array)
-        return set_bits / self.bit_size
+        return self._set_bits() / self.bit_size
 
     def estimated_count(self) -> int:
         """
@@ -121,7 +263,7 @@ class BloomFilter:
         n ≈ -m/k * ln(1 - X/m)
         where X is number of set bits
         """
-        set_bits = sum(bin(byte).count('1') for byte in self.bit_array)
+        set_bits = self._set_bits()
         if set_bits == 0:
             return 0
 
@@ -161,9 +303,8 @@ class BloomFilter:
         result = BloomFilter(self.capacity, self.error_rate)
         result.bit_size = self.bit_size
         result.hash_count = self.hash_count
-        result.bit_array = bytearray(
-            a | b for a, b in zip(self.bit_array, other.bit_array)
-        )
+        np.bitwise_or(self._words, other._words, out=result._words)
+        result._set_bit_count = None
         return result
 
     def intersection(self, other: 'BloomFilter') -> 'BloomFilter':
@@ -182,9 +323,8 @@ class BloomFilter:
         result = BloomFilter(self.capacity, self.error_rate)
         result.bit_size = self.bit_size
         result.hash_count = self.hash_count
-        result.bit_array = bytearray(
-            a & b for a, b in zip(self.bit_array, other.bit_array)
-        )
+        np.bitwise_and(self._words, other._words, out=result._words)
+        result._set_bit_count = None
         return result
 
     def to_bytes(self) -> bytes:
@@ -194,8 +334,15 @@ class BloomFilter:
     @classmethod
     def from_bytes(cls, data: bytes, capacity: int, error_rate: float) -> 'BloomFilter':
         """Deserialize from bytes"""
-        bf = cls(capacity, error_rate)
-        bf.bit_array = bytearray(data)
+        # Skip __init__ so the payload is copied once instead of zero-filling first
+        bf = cls.__new__(cls)
+        bf._configure(capacity, error_rate)
+        size = bf._byte_size
+        if len(data) == size:
+            bf.bit_array = bytearray(data)
+        else:
+            bf.bit_array = bytearray(size)
+            bf.bit_array[:len(data)] = data  # keeps word padding for shorter payloads
         return bf
 
     def __len__(self) -> int:
@@ -238,7 +385,9 @@ class ScalableBloomFilter:
 
     def contains(self, item: Union[str, bytes]) -> bool:
         """Check if item exists in any filter"""
-        return any(f.contains(item) for f in self.filters)
+        # Hash once; each filter derives its own positions from the same pair
+        h1, h2 = _hash_pair(item)
+        return any(f.contains_with_hash(h1, h2) for f in self.filters)
 
     def __contains__(self, item: Union[str, bytes]) -> bool:
         return self.contains(item)
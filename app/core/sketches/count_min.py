@@ -2,8 +2,12 @@
 Count-Min Sketch implementation for frequency estimation
 Tracks heavy hitters and frequent items with bounded error
 """
+import heapq
 import mmh3
-from typing import Union, List, Tuple
+import numpy as np
+from typing import Iterable, Optional, Union, List, Tuple
+
+_MASK64 = (1 << 64) - 1
 
 
 class CountMinSketch:
@@ -28,12 +32,18 @@ class CountMinSketch:
         """
         self.width = width
         self.depth = depth
-        self.table = [[0] * width for _ in range(depth)]
+        # Contiguous depth x width counter matrix; merges and scans are single NumPy ops
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._rows = np.arange(depth)
         self.total_count = 0
 
     def _get_positions(self, item: Union[str, bytes]) -> List[int]:
         """
-        Get positions for item using multiple hash functions
+        Get positions for item using double hashing
+
+        One 128-bit Murmur3 hash is split into two 64-bit halves h1, h2 and row
+        i uses column (h1 + i*h2) % width (Kirsch-Mitzenmacher), instead of
+        running depth independently seeded hashes over the same bytes.
 
         Args:
             item: Item to hash
@@ -44,12 +54,17 @@ class CountMinSketch:
         if isinstance(item, str):
             item = item.encode('utf-8')
 
-        positions = []
-        for seed in range(self.depth):
-            hash_value = mmh3.hash(item, seed=seed, signed=False)
-            position = hash_value % self.width
-            positions.append(position)
+        h = mmh3.hash128(item, signed=False)
+        width = self.width
+        position = (h & _MASK64) % width
+        step = (h >> 64) % width
 
+        positions = [position]
+        for _ in range(self.depth - 1):
+            position += step
+            if position >= width:
+                position -= width
+            positions.append(position)
         return positions
 
     def add(self, item: Union[str, bytes], count: int = 1) -> None:
@@ -60,11 +75,63 @@ class CountMinSketch:
             item: String or bytes to count
             count: Amount to increment (default 1)
         """
-        positions = self._get_positions(item)
-        for row, col in enumerate(positions):
-            self.table[row][col] += count
+        # One column per row, so the fancy-indexed += never hits a duplicate cell
+        self.table[self._rows, self._get_positions(item)] += count
         self.total_count += count
 
+    def add_batch(
+        self, items: Iterable[Union[str, bytes]], counts: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Increment many items with one vectorized scatter-add
+
+        Each item is hashed once (same double hashing as _get_positions), the
+        (N, depth) column matrix is built with NumPy, and np.add.at applies
+        every increment, accumulating repeated items correctly.
+
+        Args:
+            items: Strings or bytes to count
+            counts: Per-item increments (default 1 each)
+        """
+        hashes = [
+            mmh3.hash128(item.encode('utf-8') if isinstance(item, str) else item, signed=False)
+            for item in items
+        ]
+        if not hashes:
+            return
+
+        width = np.uint64(self.width)
+        h1 = np.array([h & _MASK64 for h in hashes], dtype=np.uint64) % width
+        h2 = np.array([h >> 64 for h in hashes], dtype=np.uint64) % width
+        steps = np.arange(self.depth, dtype=np.uint64)
+        columns = (h1[:, None] + steps[None, :] * h2[:, None]) % width
+
+        if counts is None:
+            increments = 1
+            total = len(hashes)
+        else:
+            counts = np.asarray(counts, dtype=np.int64)
+            increments = counts[:, None]
+            total = int(counts.sum())
+        np.add.at(self.table, (self._rows[None, :], columns.astype(np.intp)), increments)
+        self.total_count += total
+
+    def add_and_query(self, item: Union[str, bytes], count: int = 1) -> int:
+        """
+        Increment an item and return its new estimate from one hash computation
+
+        Args:
+            item: String or bytes to count
+            count: Amount to increment (default 1)
+
+        Returns:
+            Estimated count after the increment
+        """
+        cells = (self._rows, self._get_positions(item))
+        self.table[cells] += count
+        self.total_count += count
+        return int(self.table[cells].min())
+
     def query(self, item: Union[str, bytes]) -> int:
         """
         Estimate frequency of an item
@@ -75,8 +142,7 @@ class CountMinSketch:
         Returns:
             Estimated count (always >= true count)
         """
-        positions = self._get_positions(item)
-        return min(self.table[row][col] for row, col in enumerate(positions))
+        return int(self.table[self._rows, self._get_positions(item)].min())
 
     def __getitem__(self, item: Union[str, bytes]) -> int:
         """Support bracket notation for queries"""
@@ -96,9 +162,7 @@ class CountMinSketch:
             raise ValueError("Cannot merge sketches with different dimensions")
 
         merged = CountMinSketch(self.width, self.depth)
-        for i in range(self.depth):
-            for j in range(self.width):
-                merged.table[i][j] = self.table[i][j] + other.table[i][j]
+        np.add(self.table, other.table, out=merged.table)
         merged.total_count = self.total_count + other.total_count
         return merged
 
@@ -108,26 +172,27 @@ class CountMinSketch:
 
         Note: This is an approximation. For exact heavy hitters, use TopK.
 
+        Each row is sorted and the minimum is taken across rows at each rank,
+        so the i-th entry estimates the i-th largest item count and every heavy
+        hitter is reported once (not once per row). If the top i items fall in
+        distinct cells of every row this is an overestimate, like any CMS
+        count. If two of them share a cell in some row, that row's i-th
+        largest cell can be below the true i-th count and the estimate can
+        understate it (and items may be missed).
+
         Args:
             threshold_ratio: Minimum frequency ratio (default 1%)
 
         Returns:
-            List of (estimated_count, ratio) tuples
+            List of (estimated_count, ratio) tuples, largest first (at most 100)
         """
         threshold = self.total_count * threshold_ratio
-        heavy_hitters = []
 
-        # Sample from the sketch to find candidates
-        for i in range(self.depth):
-            for j in range(self.width):
-                count = self.table[i][j]
-                if count >= threshold:
-                    ratio = count / self.total_count if self.total_count > 0 else 0
-                    heavy_hitters.append((count, ratio))
-
-        # Sort by count and deduplicate
-        heavy_hitters.sort(reverse=True)
-        return heavy_hitters[:100]  # Return top 100
+        ranked = np.sort(self.table, axis=1)[:, ::-1][:, :100]  # Return top 100
+        row_min = np.minimum.reduce(ranked, axis=0)
+        counts = row_min[row_min >= threshold]
+        total = self.total_count
+        return [(int(count), count / total if total > 0 else 0) for count in counts.tolist()]
 
 
 class TopK:
@@ -146,6 +211,24 @@ class TopK:
         self.k = k
         self.items: dict = {}  # item -> count
         self.min_count = 0
+        # (count, item) min-heap with one entry per tracked item. Counts only
+        # grow, so an entry left behind by an increment is a lower bound and is
+        # refreshed lazily, only once it reaches the top
+        self._heap: List[Tuple[int, str]] = []
+
+    def _refresh_min(self) -> None:
+        """Bring the heap top up to date and read min_count from it"""
+        heap, items = self._heap, self.items
+        while heap:
+            count, item = heap[0]
+            current = items.get(item)
+            if current == count:
+                break
+            if current is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (current, item))
+        self.min_count = heap[0][0] if heap else 0
 
     def add(self, item: Union[str, bytes], count: int = 1) -> None:
         """
@@ -158,24 +241,30 @@ class TopK:
         if isinstance(item, bytes):
             item = item.decode('utf-8', errors='ignore')
 
-        if item in self.items:
-            # Item already tracked
-            self.items[item] += count
-        elif len(self.items) < self.k:
+        items = self.items
+        current = items.get(item)
+        if current is not None:
+            # Item already tracked (the steady state): one dict probe and store.
+            # The heap only needs attention if this item was the minimum
+            items[item] = current + count
+            if current == self.min_count:
+                self._refresh_min()
+            return
+
+        if len(items) < self.k:
             # Still have space
-            self.items[item] = count
-            if count < self.min_count or self.min_count == 0:
-                self.min_count = count
-        else:
-            # Find and replace minimum if new count is higher
-            if count > self.min_count:
-                # Remove minimum item
-                min_item = min(self.items, key=self.items.get)
-                del self.items[min_item]
-
-                # Add new item
-                self.items[item] = count
-                self.min_count = min(self.items.values())
+            items[item] = count
+            heapq.heappush(self._heap, (count, item))
+            self._refresh_min()
+        elif count > self.min_count:
+            # Replace the minimum item: the heap top, kept current by _refresh_min
+            _, min_item = heapq.heappop(self._heap)
+            del items[min_item]
+
+            # Add new item
+            items[item] = count
+            heapq.heappush(self._heap, (count, item))
+            self._refresh_min()
 
     def query(self, item: Union[str, bytes]) -> int:
         """Get count for specific item"""
@@ -239,8 +328,8 @@ class HeavyHittersDetector:
 
     def add(self, item: Union[str, bytes], count: int = 1) -> None:
         """Add item and update both structures"""
-        self.cms.add(item, count)
-        estimated_count = self.cms.query(item)
+        # Increment and read back in one step, hashing the item once
+        estimated_count = self.cms.add_and_query(item, count)
 
         # If item is potentially heavy hitter, track in TopK
         if estimated_count > self.threshold:
@@ -6,14 +6,17 @@ Now with Monoid-based aggregation support!
 """
 import json
 import pickle
+import struct
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
-import redis
-from redis import Redis
+from functools import cached_property
+from typing import Optional, List, Dict, Any, Iterable, Set, Tuple
+import orjson
+from redis import BlockingConnectionPool, ConnectionPool, Redis
 
 from app.config import settings
 # Use algesnake implementations
-from algesnake.approximate import HyperLogLog, BloomFilter, TopK, TDigest
+from algesnake.approximate import BloomFilter, TopK, TDigest
+from app.core.sketches.bloom_filter import BloomFilter as SketchBloomFilter
 from app.utils.time_windows import (
     TimeWindow,
     TimeWindowBucketer,
@@ -28,6 +31,72 @@ from app.core.aggregations import (
     merge_hourly_to_daily_hll,
 )
 
+# One connection pool per process, shared by every RedisStorage instance
+# (redis-py already sets TCP_NODELAY on each connection). It blocks when exhausted:
+# gevent workers can have more greenlets in flight than connections, and they should
+# wait for a free one instead of raising ConnectionError
+connection_pool = BlockingConnectionPool.from_url(
+    settings.get_redis_url(),
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_POOL_TIMEOUT,
+    socket_keepalive=True,
+    decode_responses=False,  # Handle bytes for serialization
+)
+
+# SSE subscribers hold a connection for the whole life of a stream, so they get their
+# own pool: idle dashboards cannot starve request handlers of pooled connections
+pubsub_connection_pool = ConnectionPool.from_url(
+    settings.get_redis_url(),
+    max_connections=settings.SSE_MAX_CONNECTIONS,
+    socket_keepalive=True,
+)
+
+# PFADD + EXPIRE for many HLL keys in one server-side call.
+# ARGV holds, per key in KEYS order: ttl, value count, values...
+HLL_ADD_SCRIPT = """
+local i = 1
+for k = 1, #KEYS do
+    local n = tonumber(ARGV[i + 1])
+    redis.call('PFADD', KEYS[k], unpack(ARGV, i + 2, i + 1 + n))
+    redis.call('EXPIRE', KEYS[k], ARGV[i])
+    i = i + 2 + n
+end
+return #KEYS
+"""
+
+# Keyspace walks: SCAN COUNT hint and keys per UNLINK command
+SCAN_COUNT = 1000
+DELETE_BATCH_SIZE = 500
+
+# In-tree Bloom filter payload: magic, capacity, error rate, then to_bytes().
+# Any other filter type (algesnake's included) and payloads written by earlier
+# versions are pickles
+BLOOM_MAGIC = b"BF1"
+_BLOOM_HEADER = struct.Struct("<3sId")
+
+
+def dump_bloom(bloom: BloomFilter) -> bytes:
+    """
+    Serialize a Bloom filter for Redis
+
+    Only the in-tree BloomFilter, whose state is fully described by capacity,
+    error rate and its bit array, gets the compact header + bits layout.
+    Every other type is pickled so no internal state is dropped.
+    """
+    if type(bloom) is not SketchBloomFilter:
+        return pickle.dumps(bloom)
+    return _BLOOM_HEADER.pack(BLOOM_MAGIC, bloom.capacity, bloom.error_rate) + bloom.to_bytes()
+
+
+def load_bloom(data: bytes) -> BloomFilter:
+    """Inverse of dump_bloom; also reads pickled filters"""
+    if not data.startswith(BLOOM_MAGIC):
+        return pickle.loads(data)
+    _, capacity, error_rate = _BLOOM_HEADER.unpack_from(data)
+    return SketchBloomFilter.from_bytes(
+        memoryview(data)[_BLOOM_HEADER.size:], capacity=capacity, error_rate=error_rate
+    )
+
 
 class RedisStorage:
     """
@@ -40,19 +109,42 @@ class RedisStorage:
         Initialize Redis storage
 
         Args:
-            redis_client: Optional Redis client (creates new if None)
+            redis_client: Optional Redis client (uses the shared pools if None)
         """
         if redis_client:
             self.redis = redis_client
+            self.pubsub_redis = redis_client
         else:
-            self.redis = redis.from_url(
-                settings.get_redis_url(),
-                decode_responses=False,  # Handle bytes for serialization
-            )
+            self.redis = Redis(connection_pool=connection_pool)
+            self.pubsub_redis = Redis(connection_pool=pubsub_connection_pool)
 
         self.key_gen = RedisKeyGenerator()
         self.bucketer = TimeWindowBucketer()
 
+    @cached_property
+    def native_bloom(self) -> bool:
+        """
+        Whether Bloom filters live server-side as RedisBloom keys
+
+        BF.INSERT/BF.EXISTS update and query a filter atomically in one command,
+        with no client-side load/modify/save race and no serialization. Checked
+        once per storage instance via MODULE LIST; servers that refuse the
+        command are treated as not having the module.
+        """
+        if not settings.BLOOM_USE_REDISBLOOM:
+            return False
+        try:
+            modules = self.redis.module_list()
+        except Exception:
+            return False
+        for module in modules:
+            name = module.get(b"name", module.get("name", b""))
+            if isinstance(name, bytes):
+                name = name.decode("utf-8", "ignore")
+            if name.lower() in ("bf", "rebloom"):
+                return True
+        return False
+
     def ping(self) -> bool:
         """Check Redis connection"""
         try:
@@ -95,6 +187,38 @@ class RedisStorage:
             ttl = self.bucketer.get_retention_seconds(window)
             self.redis.expire(key, ttl)
 
+    def _group_hll_updates(
+        self, updates: Iterable[Tuple[str, str, str, datetime, List[TimeWindow]]]
+    ) -> Dict[str, Tuple[TimeWindow, Set[str]]]:
+        """Group HLL updates by key as {key: (window, values)}"""
+        grouped: Dict[str, Tuple[TimeWindow, Set[str]]] = {}
+        keys: Dict[tuple, str] = {}
+        for metric, system, value, timestamp, windows in updates:
+            for window in windows:
+                bucket = (metric, system, window, timestamp)
+                key = keys.get(bucket)
+                if key is None:
+                    key = keys[bucket] = self.key_gen.hll_key(metric, system, window, timestamp)
+                entry = grouped.get(key)
+                if entry is None:
+                    entry = grouped[key] = (window, set())
+                entry[1].add(value)
+        return grouped
+
+    def _queue_hll_writes(self, pipe, grouped: Dict[str, Tuple[TimeWindow, Set[str]]]) -> None:
+        """Queue every grouped PFADD + EXPIRE as a single HLL_ADD_SCRIPT call on a pipeline"""
+        if not grouped:
+            return
+
+        args: List[Any] = []
+        for window, values in grouped.values():
+            args.append(self.bucketer.get_retention_seconds(window))
+            args.append(len(values))
+            args.extend(values)
+        # Plain EVAL: Redis caches the compiled script by body, and unlike a
+        # registered Script it does not add a SCRIPT EXISTS round-trip per pipeline
+        pipe.eval(HLL_ADD_SCRIPT, len(grouped), *grouped, *args)
+
     def get_hll_cardinality(
         self, metric: str, system: str, window: TimeWindow, timestamp: Optional[datetime] = None
     ) -> int:
@@ -168,6 +292,10 @@ class RedisStorage:
             window: Time window
         """
         timestamp = timestamp or datetime.utcnow()
+        if self.native_bloom:
+            self.add_to_bloom_batch([(metric, system, value, timestamp, window)])
+            return
+
         key = self.key_gen.bloom_key(metric, system, window, timestamp)
 
         # Load existing Bloom filter or create new
@@ -182,6 +310,82 @@ class RedisStorage:
         # Save back to Redis
         self._save_bloom(key, bloom, window)
 
+    def add_to_bloom_batch(
+        self, updates: Iterable[Tuple[str, str, str, datetime, TimeWindow]]
+    ) -> int:
+        """
+        Add many values to Bloom filters, loading and saving each filter once
+
+        All touched filters are fetched with one MGET and written back with one
+        pipelined round-trip of SETEX commands (with RedisBloom, one BF.INSERT
+        per filter and no read at all).
+
+        Args:
+            updates: (metric, system, value, timestamp, window) tuples
+
+        Returns:
+            Number of Bloom filter keys updated
+        """
+        grouped = self._group_bloom_updates(updates)
+        if not grouped:
+            return 0
+
+        stored = [] if self.native_bloom else self.redis.mget(list(grouped))
+        pipe = self.redis.pipeline(transaction=False)
+        self._queue_bloom_writes(pipe, grouped, stored)
+        pipe.execute()
+
+        return len(grouped)
+
+    def _group_bloom_updates(
+        self, updates: Iterable[Tuple[str, str, str, datetime, TimeWindow]]
+    ) -> Dict[str, Tuple[TimeWindow, List[str]]]:
+        """Group Bloom updates by key as {key: (window, values)}"""
+        grouped: Dict[str, Tuple[TimeWindow, List[str]]] = {}
+        keys: Dict[tuple, str] = {}
+        bloom_key = self.key_gen.native_bloom_key if self.native_bloom else self.key_gen.bloom_key
+        for metric, system, value, timestamp, window in updates:
+            bucket = (metric, system, window, timestamp)
+            key = keys.get(bucket)
+            if key is None:
+                key = keys[bucket] = bloom_key(metric, system, window, timestamp)
+            entry = grouped.get(key)
+            if entry is None:
+                entry = grouped[key] = (window, [])
+            entry[1].append(value)
+        return grouped
+
+    def _queue_bloom_writes(
+        self,
+        pipe,
+        grouped: Dict[str, Tuple[TimeWindow, List[str]]],
+        stored: List[Optional[bytes]],
+    ) -> None:
+        """Apply grouped values to the stored filters and queue one SETEX per key"""
+        if self.native_bloom:
+            # Server-side filters: one atomic BF.INSERT (creating the filter with
+            # the configured capacity/error rate if needed) plus EXPIRE per key
+            for key, (window, values) in grouped.items():
+                pipe.execute_command(
+                    "BF.INSERT", key,
+                    "CAPACITY", settings.BLOOM_CAPACITY,
+                    "ERROR", settings.BLOOM_ERROR_RATE,
+                    "ITEMS", *values,
+                )
+                pipe.expire(key, self.bucketer.get_retention_seconds(window))
+            return
+
+        for (key, (window, values)), data in zip(grouped.items(), stored):
+            if data is None:
+                bloom = BloomFilter(
+                    capacity=settings.BLOOM_CAPACITY, error_rate=settings.BLOOM_ERROR_RATE
+                )
+            else:
+                bloom = load_bloom(data)
+            for value in values:
+                bloom.add(value)
+            pipe.setex(key, self.bucketer.get_retention_seconds(window), dump_bloom(bloom))
+
     def check_bloom(
         self,
         metric: str,
@@ -193,6 +397,10 @@ class RedisStorage:
         """
         Check if value exists in Bloom filter
 
+        With RedisBloom, a BF.EXISTS miss falls back to the serialized filter
+        under the legacy bloom:* key, so history written before the module was
+        enabled stays visible until that key's retention runs out.
+
         Args:
             metric: Metric name
             system: System name
@@ -205,6 +413,11 @@ class RedisStorage:
             False if value definitely does NOT exist
         """
         timestamp = timestamp or datetime.utcnow()
+        if self.native_bloom:
+            key = self.key_gen.native_bloom_key(metric, system, window, timestamp)
+            if self.redis.execute_command("BF.EXISTS", key, value):
+                return True
+
         key = self.key_gen.bloom_key(metric, system, window, timestamp)
 
         bloom = self._load_bloom(key)
@@ -218,11 +431,11 @@ class RedisStorage:
         data = self.redis.get(key)
         if data is None:
             return None
-        return pickle.loads(data)
+        return load_bloom(data)
 
     def _save_bloom(self, key: str, bloom: BloomFilter, window: TimeWindow) -> None:
         """Save Bloom filter to Redis"""
-        data = pickle.dumps(bloom)
+        data = dump_bloom(bloom)
         ttl = self.bucketer.get_retention_seconds(window)
         self.redis.setex(key, ttl, data)
 
@@ -263,6 +476,90 @@ class RedisStorage:
         # Save back to Redis
         self._save_topk(key, topk, window)
 
+    def _group_topk_updates(
+        self, updates: Iterable[Tuple[str, str, str, datetime, TimeWindow]]
+    ) -> Dict[str, Tuple[TimeWindow, Dict[str, int]]]:
+        """Group TopK updates by key as {key: (window, {value: count})}"""
+        grouped: Dict[str, Tuple[TimeWindow, Dict[str, int]]] = {}
+        keys: Dict[tuple, str] = {}
+        for metric, system, value, timestamp, window in updates:
+            bucket = (metric, system, window, timestamp)
+            key = keys.get(bucket)
+            if key is None:
+                key = keys[bucket] = self.key_gen.topk_key(metric, system, window, timestamp)
+            entry = grouped.get(key)
+            if entry is None:
+                entry = grouped[key] = (window, {})
+            counts = entry[1]
+            counts[value] = counts.get(value, 0) + 1
+        return grouped
+
+    def _queue_topk_writes(
+        self,
+        pipe,
+        grouped: Dict[str, Tuple[TimeWindow, Dict[str, int]]],
+        stored: List[Optional[bytes]],
+    ) -> None:
+        """Apply grouped counts to the stored trackers and queue one SETEX per key"""
+        for (key, (window, counts)), data in zip(grouped.items(), stored):
+            topk = TopK(k=100) if data is None else pickle.loads(data)
+            for value, count in counts.items():
+                topk.add(value, count)
+            pipe.setex(key, self.bucketer.get_retention_seconds(window), pickle.dumps(topk))
+
+    # =====================
+    # Combined ingest
+    # =====================
+
+    def apply_updates(
+        self,
+        hll_updates: Iterable[Tuple[str, str, str, datetime, List[TimeWindow]]],
+        bloom_updates: Iterable[Tuple[str, str, str, datetime, TimeWindow]],
+        topk_updates: Iterable[Tuple[str, str, str, datetime, TimeWindow]],
+        events: Iterable[Dict[str, Any]] = (),
+    ) -> None:
+        """
+        Apply every sketch update and publish for one event or a whole batch
+
+        Runs in two pipelined round-trips regardless of batch size: one to
+        read the stored Bloom filters and TopK trackers, one to write all
+        PFADD/EXPIRE, SETEX and PUBLISH commands. Updates are independent, so
+        neither pipeline uses MULTI/EXEC.
+
+        Args:
+            hll_updates: (metric, system, value, timestamp, windows) tuples
+            bloom_updates: (metric, system, value, timestamp, window) tuples
+            topk_updates: (metric, system, value, timestamp, window) tuples
+            events: Stream payloads to publish, in order
+        """
+        hll_grouped = self._group_hll_updates(hll_updates)
+        bloom_grouped = self._group_bloom_updates(bloom_updates)
+        topk_grouped = self._group_topk_updates(topk_updates)
+
+        bloom_stored: List[Optional[bytes]] = []
+        topk_stored: List[Optional[bytes]] = []
+        read_blooms = bool(bloom_grouped) and not self.native_bloom
+        if read_blooms or topk_grouped:
+            reads = self.redis.pipeline(transaction=False)
+            if read_blooms:
+                reads.mget(list(bloom_grouped))
+            if topk_grouped:
+                reads.mget(list(topk_grouped))
+            results = reads.execute()
+            if read_blooms:
+                bloom_stored = results.pop(0)
+            if topk_grouped:
+                topk_stored = results.pop(0)
+
+        pipe = self.redis.pipeline(transaction=False)
+        self._queue_hll_writes(pipe, hll_grouped)
+        self._queue_bloom_writes(pipe, bloom_grouped, bloom_stored)
+        self._queue_topk_writes(pipe, topk_grouped, topk_stored)
+        channel = self.key_gen.event_stream_key()
+        for event in events:
+            pipe.publish(channel, orjson.dumps(event, default=str))
+        pipe.execute()
+
     def get_topk(
         self,
         metric: str,
@@ -291,8 +588,45 @@ class RedisStorage:
         if topk is None:
             return []
 
-        results = topk.top_k(k)
-        return [{"item": item, "count": count} for item, count in results]
+        return self._format_topk(topk, k)
+
+    @staticmethod
+    def _format_topk(topk: TopK, k: int) -> List[Dict[str, Any]]:
+        """Convert a TopK tracker to a list of {"item": str, "count": int} dicts"""
+        return [{"item": item, "count": count} for item, count in topk.top_k(k)]
+
+    def get_summary_reads(
+        self,
+        system: str,
+        timestamp: datetime,
+        hll_queries: List[Tuple[str, TimeWindow]],
+        topk_queries: List[Tuple[str, TimeWindow, int]],
+    ) -> Tuple[List[int], List[List[Dict[str, Any]]]]:
+        """
+        Read several HLL cardinalities and TopK lists in one pipelined round-trip
+
+        Args:
+            system: System name
+            timestamp: Query timestamp
+            hll_queries: (metric, window) pairs to PFCOUNT
+            topk_queries: (metric, window, k) triples to read
+
+        Returns:
+            (cardinalities, topk item lists), each in query order
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        for metric, window in hll_queries:
+            pipe.pfcount(self.key_gen.hll_key(metric, system, window, timestamp))
+        for metric, window, _ in topk_queries:
+            pipe.get(self.key_gen.topk_key(metric, system, window, timestamp))
+        results = pipe.execute()
+
+        counts = results[:len(hll_queries)]
+        topks = [
+            self._format_topk(pickle.loads(data), k) if data is not None else []
+            for (_, _, k), data in zip(topk_queries, results[len(hll_queries):])
+        ]
+        return counts, topks
 
     def _load_topk(self, key: str) -> Optional[TopK]:
         """Load TopK from Redis"""
@@ -418,6 +752,7 @@ class RedisStorage:
         timestamp = timestamp or datetime.utcnow()
         key = self.key_gen.tdigest_key(metric, system, window, timestamp)
 
+        # One GET for the whole digest; all quantiles are then computed locally
         tdigest = self._load_tdigest(key)
         if tdigest is None:
             return {p: None for p in percentiles}
@@ -465,13 +800,9 @@ class RedisStorage:
             timestamps.append(current)
             current += duration
 
-        # Fetch T-Digests
-        tdigests = []
-        for ts in timestamps:
-            key = self.key_gen.tdigest_key(metric, system, window, ts)
-            td = self._load_tdigest(key)
-            if td is not None:
-                tdigests.append(td)
+        # Fetch all T-Digests in a single round-trip
+        keys = [self.key_gen.tdigest_key(metric, system, window, ts) for ts in timestamps]
+        tdigests = [td for td in self._load_tdigests(keys) if td is not None]
 
         if not tdigests:
             return None
@@ -486,6 +817,12 @@ class RedisStorage:
             return None
         return pickle.loads(data)
 
+    def _load_tdigests(self, keys: List[str]) -> List[Optional[TDigest]]:
+        """Load several T-Digests from Redis with one MGET"""
+        if not keys:
+            return []
+        return [pickle.loads(data) if data is not None else None for data in self.redis.mget(keys)]
+
     def _save_tdigest(self, key: str, tdigest: TDigest, window: TimeWindow) -> None:
         """Save T-Digest to Redis"""
         data = pickle.dumps(tdigest)
@@ -504,9 +841,22 @@ class RedisStorage:
             event: Event dictionary
         """
         channel = self.key_gen.event_stream_key()
-        message = json.dumps(event, default=str)
+        message = orjson.dumps(event, default=str)
         self.redis.publish(channel, message)
 
+    def publish_events(self, events: Iterable[Dict[str, Any]]) -> None:
+        """
+        Publish several events to the real-time stream in one pipelined round-trip
+
+        Args:
+            events: Event dictionaries, published in order
+        """
+        channel = self.key_gen.event_stream_key()
+        pipe = self.redis.pipeline(transaction=False)
+        for event in events:
+            pipe.publish(channel, orjson.dumps(event, default=str))
+        pipe.execute()
+
     def subscribe_to_events(self):
         """
         Subscribe to event stream
@@ -514,7 +864,7 @@ class RedisStorage:
         Returns:
             Redis PubSub object
         """
-        pubsub = self.redis.pubsub()
+        pubsub = self.pubsub_redis.pubsub()
         channel = self.key_gen.event_stream_key()
         pubsub.subscribe(channel)
         return pubsub
@@ -564,7 +914,11 @@ class RedisStorage:
         Returns:
             List of keys
         """
-        return [key.decode() if isinstance(key, bytes) else key for key in self.redis.keys(pattern)]
+        # Incremental SCAN instead of KEYS, which blocks the server for the whole keyspace
+        return [
+            key.decode() if isinstance(key, bytes) else key
+            for key in self.redis.scan_iter(match=pattern, count=SCAN_COUNT)
+        ]
 
     def delete_keys(self, pattern: str) -> int:
         """
@@ -576,10 +930,18 @@ class RedisStorage:
         Returns:
             Number of keys deleted
         """
-        keys = self.redis.keys(pattern)
-        if keys:
-            return self.redis.delete(*keys)
-        return 0
+        # SCAN in batches and UNLINK each batch: memory is reclaimed in a
+        # background thread and no single command walks the whole keyspace
+        pipe = self.redis.pipeline(transaction=False)
+        batch: List[bytes] = []
+        for key in self.redis.scan_iter(match=pattern, count=SCAN_COUNT):
+            batch.append(key)
+            if len(batch) >= DELETE_BATCH_SIZE:
+                pipe.unlink(*batch)
+                batch = []
+        if batch:
+            pipe.unlink(*batch)
+        return sum(pipe.execute())
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -608,9 +970,9 @@ class RedisStorage:
         start_time: datetime,
         end_time: datetime,
         precision: int = 14
-    ) -> HyperLogLog:
+    ) -> int:
         """
-        Merge HLLs across time windows using Monoid
+        Merge HLLs across time windows
 
         Args:
             metric: Metric name
@@ -618,14 +980,14 @@ class RedisStorage:
             source_window: Source window granularity (e.g., hourly)
             start_time: Start of range
             end_time: End of range
-            precision: HLL precision
+            precision: Unused; Redis native HLLs have a fixed precision
 
         Returns:
-            Merged HLL with deduplicated cardinality
+            Deduplicated cardinality across the time range
 
         Example:
             # Get daily unique users from hourly data
-            hll = storage.merge_hll_time_windows(
+            daily_users = storage.merge_hll_time_windows(
                 metric="users",
                 system="prod",
                 source_window=TimeWindow.HOUR,
@@ -642,35 +1004,23 @@ class RedisStorage:
             timestamps.append(current)
             current += duration
 
-        # Fetch HLLs from Redis
-        hlls = []
-        for ts in timestamps:
-            key = self.key_gen.hll_key(metric, system, source_window, ts)
-            count = self.redis.pfcount(key)
-            if count > 0:
-                # Create HLL from Redis native HLL
-                # Note: We can't directly deserialize Redis HLL,
-                # so we use the count as approximate
-                hll = HyperLogLog(precision=precision)
-                # This is a limitation - ideally we'd export/import Redis HLL bytes
-                hlls.append((key, count))
-
-        # Use merge command if multiple keys exist
-        if len(hlls) > 1:
-            merge_key = f"temp:merge:{metric}:{system}:{int(datetime.utcnow().timestamp())}"
-            source_keys = [key for key, _ in hlls]
-            self.redis.pfmerge(merge_key, *source_keys)
-            merged_count = self.redis.pfcount(merge_key)
-            self.redis.delete(merge_key)
-
-            # Return approximate HLL
-            result = HyperLogLog(precision=precision)
-            # Note: This is approximate; real impl would need Redis HLL export
-            return result
-        elif len(hlls) == 1:
-            return HyperLogLog(precision=precision)
-        else:
-            return HyperLogLog(precision=precision)
+        source_keys = [
+            self.key_gen.hll_key(metric, system, source_window, ts) for ts in timestamps
+        ]
+        if not source_keys:
+            return 0
+
+        # PFMERGE treats missing keys as empty HLLs, so every candidate window is
+        # merged server-side without probing each one first; merge, count and
+        # cleanup share one round-trip
+        merge_key = f"temp:merge:{metric}:{system}:{int(datetime.utcnow().timestamp())}"
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.pfmerge(merge_key, *source_keys)
+        pipe.pfcount(merge_key)
+        pipe.delete(merge_key)
+        _, merged_count, _ = pipe.execute()
+
+        return merged_count
 
     def merge_hll_systems(
         self,
@@ -708,11 +1058,13 @@ class RedisStorage:
             for system in systems
         ]
 
-        # Use Redis PFMERGE
+        # Use Redis PFMERGE; merge, count and cleanup share one round-trip
         merge_key = f"temp:merge:{metric}:systems:{int(timestamp.timestamp())}"
-        self.redis.pfmerge(merge_key, *keys)
-        total = self.redis.pfcount(merge_key)
-        self.redis.delete(merge_key)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.pfmerge(merge_key, *keys)
+        pipe.pfcount(merge_key)
+        pipe.delete(merge_key)
+        _, total, _ = pipe.execute()
 
         return total
 
@@ -759,13 +1111,10 @@ class RedisStorage:
             timestamps.append(current)
             current += duration
 
-        # Fetch TopK structures
-        topk_list = []
-        for ts in timestamps:
-            key = self.key_gen.topk_key(metric, system, window, ts)
-            topk = self._load_topk(key)
-            if topk is not None:
-                topk_list.append(topk)
+        # Fetch TopK structures with one MGET
+        keys = [self.key_gen.topk_key(metric, system, window, ts) for ts in timestamps]
+        stored = self.redis.mget(keys) if keys else []
+        topk_list = [pickle.loads(data) for data in stored if data is not None]
 
         if not topk_list:
             return []
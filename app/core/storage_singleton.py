@@ -0,0 +1,7 @@
+"""
+Process-wide RedisStorage instance shared by all API blueprints
+"""
+from app.core.storage import RedisStorage
+
+# One storage object (and its shared connection pools) per worker process
+storage = RedisStorage()
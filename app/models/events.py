@@ -1,9 +1,10 @@
 """
 Event models and schemas
 """
+import sys
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Optional, Dict, Any, List
+from pydantic import BaseModel, Field, TypeAdapter, validator
 from enum import Enum
 
 
@@ -38,6 +39,11 @@ class Event(BaseModel):
             return datetime.fromisoformat(v.replace("Z", "+00:00"))
         return v
 
+    @validator("system")
+    def intern_system(cls, v):
+        """Intern the system name: a handful of values repeated across every event"""
+        return sys.intern(v)
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -60,6 +66,10 @@ class BatchEventRequest(BaseModel):
     events: List[Event] = Field(..., max_length=1000)
 
 
+# Validates a batch's event list directly, without building the wrapper model
+event_list_adapter = TypeAdapter(Annotated[List[Event], Field(max_length=1000)])
+
+
 class EventResponse(BaseModel):
     """Event submission response"""
 
@@ -98,3 +108,14 @@ class TopKResponse(BaseModel):
     window: str
     items: List[Dict[str, Any]]
     timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+
+def warm_up_models() -> None:
+    """
+    Run each request-path model once so lazy validator/serializer setup
+    happens at import time instead of on the first request
+    """
+    example = Event.model_config["json_schema_extra"]["example"]
+    BatchEventRequest(events=[example])
+    event_list_adapter.validate_python([example])
+    EventResponse(success=True, message="warm-up").model_dump()
@@ -0,0 +1,49 @@
+"""
+JSON request/response helpers backed by orjson
+"""
+from typing import Any, Optional
+
+import orjson
+from flask import Response, request
+
+# Naive datetimes in this app are always UTC (datetime.utcnow)
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+
+def json_response(payload: Any, status: int = 200) -> Response:
+    """
+    Build a JSON response without going through Flask's stdlib-json provider
+
+    Args:
+        payload: JSON-serializable object (dict, list, ...)
+        status: HTTP status code
+
+    Returns:
+        Flask Response with application/json mimetype
+    """
+    return Response(
+        orjson.dumps(payload, option=ORJSON_OPTIONS),
+        status=status,
+        mimetype="application/json",
+    )
+
+
+def json_body(default: Optional[Any] = None) -> Any:
+    """
+    Parse the current request body with orjson
+
+    Args:
+        default: Value returned for an empty body (raise if None)
+
+    Returns:
+        Decoded JSON value
+
+    Raises:
+        ValueError: If the body is empty (and no default) or not valid JSON
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        if default is not None:
+            return default
+        raise ValueError("Request body must be a JSON document")
+    return orjson.loads(raw)
@@ -2,8 +2,10 @@
 Time window utilities for bucketing events and queries
 """
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List
 from enum import Enum
+import sys
 
 
 class TimeWindow(str, Enum):
@@ -57,6 +59,22 @@ class TimeWindowBucketer:
         else:
             raise ValueError(f"Unknown window type: {window}")
 
+    @staticmethod
+    def floor_to_hour(timestamp: datetime) -> datetime:
+        """
+        Truncate a timestamp to the start of its hour
+
+        Every bucket of an hourly or coarser window is unchanged by this, so
+        callers can floor once and reuse the result as a key-cache entry.
+
+        Args:
+            timestamp: Datetime to truncate
+
+        Returns:
+            Datetime with minutes, seconds and microseconds zeroed
+        """
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+
     @staticmethod
     def parse_window_string(window_str: str) -> TimeWindow:
         """
@@ -149,6 +167,12 @@ class TimeWindowBucketer:
         return int(duration.total_seconds() * multiplier)
 
 
+@lru_cache(maxsize=4096)
+def _key_prefix(kind: str, metric: str, system: str, window: TimeWindow) -> str:
+    """Interned "kind:metric:system:window:" prefix, built once per combination"""
+    return sys.intern(f"{kind}:{metric}:{system}:{window.value}:")
+
+
 class RedisKeyGenerator:
     """
     Generate consistent Redis keys for probabilistic data structures
@@ -169,25 +193,31 @@ class RedisKeyGenerator:
             Redis key (e.g., "hll:users:prod:1h:2025-10-16T10:00:00")
         """
         bucket = TimeWindowBucketer.bucket_timestamp(timestamp, window)
-        return f"hll:{metric}:{system}:{window.value}:{bucket}"
+        return _key_prefix("hll", metric, system, window) + bucket
 
     @staticmethod
     def bloom_key(metric: str, system: str, window: TimeWindow, timestamp: datetime) -> str:
         """Generate Bloom filter key"""
         bucket = TimeWindowBucketer.bucket_timestamp(timestamp, window)
-        return f"bloom:{metric}:{system}:{window.value}:{bucket}"
+        return _key_prefix("bloom", metric, system, window) + bucket
+
+    @staticmethod
+    def native_bloom_key(metric: str, system: str, window: TimeWindow, timestamp: datetime) -> str:
+        """Generate RedisBloom (BF.*) key, kept apart from serialized filter keys"""
+        bucket = TimeWindowBucketer.bucket_timestamp(timestamp, window)
+        return _key_prefix("bf", metric, system, window) + bucket
 
     @staticmethod
     def cms_key(metric: str, system: str, window: TimeWindow, timestamp: datetime) -> str:
         """Generate Count-Min Sketch key"""
         bucket = TimeWindowBucketer.bucket_timestamp(timestamp, window)
-        return f"cms:{metric}:{system}:{window.value}:{bucket}"
+        return _key_prefix("cms", metric, system, window) + bucket
 
     @staticmethod
     def topk_key(metric: str, system: str, window: TimeWindow, timestamp: datetime) -> str:
         """Generate TopK key"""
         bucket = TimeWindowBucketer.bucket_timestamp(timestamp, window)
-        return f"topk:{metric}:{system}:{window.value}:{bucket}"
+        return _key_prefix("topk", metric, system, window) + bucket
 
     @staticmethod
     def tdigest_key(metric: str, system: str, window: TimeWindow, timestamp: datetime) -> str:
@@ -204,7 +234,7 @@ class RedisKeyGenerator:
             Redis key (e.g., "tdigest:api_latency:prod:1h:2025-10-16T10:00:00")
         """
         bucket = TimeWindowBucketer.bucket_timestamp(timestamp, window)
-        return f"tdigest:{metric}:{system}:{window.value}:{bucket}"
+        return _key_prefix("tdigest", metric, system, window) + bucket
 
     @staticmethod
     def event_stream_key() -> str:
@@ -0,0 +1,20 @@
+"""
+Gunicorn configuration for production deployments
+
+The API endpoints spend most of their time waiting on Redis, so workers
+use gevent: each worker multiplexes many in-flight requests (including
+long-lived SSE streams) over cooperative greenlets instead of OS threads.
+
+Usage:
+    gunicorn -c gunicorn_conf.py app:app
+"""
+import multiprocessing
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gevent"
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 1000))
+timeout = 120
+keepalive = 5
+
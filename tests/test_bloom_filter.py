@@ -0,0 +1,144 @@
+"""
+Tests for Bloom Filter implementation
+"""
+import pytest
+from app.core.sketches.bloom_filter import BloomFilter, ScalableBloomFilter
+
+
+class TestBloomFilter:
+    """Test BloomFilter functionality"""
+
+    def test_no_false_negatives(self):
+        """Every added item must be reported as present"""
+        bf = BloomFilter(capacity=10000, error_rate=0.01)
+
+        for i in range(10000):
+            bf.add(f"user_{i}")
+
+        assert all(f"user_{i}" in bf for i in range(10000))
+
+    def test_false_positive_rate(self):
+        """False positive rate should stay close to the configured error rate"""
+        bf = BloomFilter(capacity=10000, error_rate=0.01)
+
+        for i in range(10000):
+            bf.add(f"user_{i}")
+
+        false_positives = sum(f"other_{i}" in bf for i in range(20000))
+        rate = false_positives / 20000
+        assert rate < 0.02, f"False positive rate {rate} too high"
+
+    def test_positions_in_range(self):
+        """Derived bit positions must fall within the bit array"""
+        bf = BloomFilter(capacity=1000, error_rate=0.001)
+        positions = bf._get_positions("user_1")
+
+        assert len(positions) == bf.hash_count
+        assert all(0 <= p < bf.bit_size for p in positions)
+
+    def test_contains_many_matches_contains(self):
+        """Vectorized batch check agrees with per-item contains"""
+        bf = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(500):
+            bf.add(f"user_{i}")
+
+        items = [f"user_{i}" for i in range(1000)]
+        results = bf.contains_many(items)
+
+        assert list(results) == [bf.contains(item) for item in items]
+        assert results[:500].all()
+
+    def test_add_positions_shared_across_filters(self):
+        """One hash computation can populate several same-parameter filters"""
+        daily = BloomFilter(capacity=1000, error_rate=0.01)
+        weekly = BloomFilter(capacity=1000, error_rate=0.01)
+
+        positions = daily._get_positions("user1:prod")
+        daily.add_positions(positions)
+        weekly.add_positions(positions)
+
+        assert "user1:prod" in daily
+        assert "user1:prod" in weekly
+
+    def test_union(self):
+        """Union contains items from both filters"""
+        bf1 = BloomFilter(capacity=1000, error_rate=0.001)
+        bf2 = BloomFilter(capacity=1000, error_rate=0.001)
+        bf1.add("user1")
+        bf2.add("user2")
+
+        merged = bf1.union(bf2)
+
+        assert "user1" in merged
+        assert "user2" in merged
+
+    def test_intersection(self):
+        """Intersection keeps only items present in both filters"""
+        bf1 = BloomFilter(capacity=1000, error_rate=0.001)
+        bf2 = BloomFilter(capacity=1000, error_rate=0.001)
+        bf1.add("shared")
+        bf1.add("only1")
+        bf2.add("shared")
+        bf2.add("only2")
+
+        common = bf1.intersection(bf2)
+
+        assert "shared" in common
+        assert "only1" not in common
+        assert "only2" not in common
+
+    def test_estimated_count(self):
+        """Popcount-based estimate tracks the number of added items"""
+        bf = BloomFilter(capacity=10000, error_rate=0.01)
+        assert bf.estimated_count() == 0
+
+        for i in range(1000):
+            bf.add(f"user_{i}")
+
+        set_bits = sum(bin(byte).count('1') for byte in bf.bit_array)
+        assert bf.estimated_fill_ratio() == set_bits / bf.bit_size
+        assert abs(bf.estimated_count() - 1000) < 50
+
+    def test_set_bit_count_stays_exact(self):
+        """Incremental set-bit count matches a full popcount after every mutation"""
+        def popcount(bf):
+            return sum(bin(byte).count('1') for byte in bf.bit_array)
+
+        bf1 = BloomFilter(capacity=1000, error_rate=0.01)
+        bf2 = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(300):
+            bf1.add(f"user_{i}")
+            bf1.add(f"user_{i}")
+            bf2.add(f"other_{i}")
+
+        restored = BloomFilter.from_bytes(bf1.to_bytes(), capacity=1000, error_rate=0.01)
+        for bf in (bf1, bf1.union(bf2), bf1.intersection(bf2), restored):
+            assert bf._set_bits() == popcount(bf)
+
+    def test_serialization(self):
+        """Round-trip through bytes preserves membership"""
+        bf = BloomFilter(capacity=1000, error_rate=0.001)
+        for i in range(100):
+            bf.add(f"user_{i}")
+
+        restored = BloomFilter.from_bytes(bf.to_bytes(), capacity=1000, error_rate=0.001)
+
+        assert all(f"user_{i}" in restored for i in range(100))
+
+
+class TestScalableBloomFilter:
+    """Test ScalableBloomFilter growth"""
+
+    def test_grows_and_keeps_members(self):
+        """Filter grows past initial capacity without losing items"""
+        sbf = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+
+        for i in range(1000):
+            sbf.add(f"user_{i}")
+
+        assert len(sbf.filters) > 1
+        assert all(f"user_{i}" in sbf for i in range(1000))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
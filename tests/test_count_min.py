@@ -0,0 +1,104 @@
+"""
+Tests for Count-Min Sketch and TopK implementations
+"""
+import math
+import random
+
+import numpy as np
+import pytest
+from app.core.sketches.count_min import CountMinSketch, TopK
+
+
+def _reference_topk(stream, k):
+    """Space-Saving with linear scans: evicts the smallest (count, item) pair"""
+    items = {}
+    for item, count in stream:
+        if item in items:
+            items[item] += count
+        elif len(items) < k:
+            items[item] = count
+        elif count > min(items.values()):
+            _, evicted = min((c, i) for i, c in items.items())
+            del items[evicted]
+            items[item] = count
+        yield dict(items), min(items.values())
+
+
+class TestCountMinSketch:
+    """Test CountMinSketch functionality"""
+
+    def test_heavy_hitters_skewed_stream(self):
+        """Each heavy item is reported once, largest first, within the CMS error bound"""
+        cms = CountMinSketch(width=1000, depth=5)
+        heavy = {"user_a": 5000, "user_b": 3000, "user_c": 1000}
+        for item, count in heavy.items():
+            for _ in range(count):
+                cms.add(item)
+        for i in range(1000):
+            cms.add(f"light_{i}")
+
+        hitters = cms.get_heavy_hitters(threshold_ratio=0.05)
+
+        error = math.e / cms.width * cms.total_count
+        assert len(hitters) == len(heavy)
+        for (estimate, ratio), true_count in zip(hitters, sorted(heavy.values(), reverse=True)):
+            assert true_count <= estimate <= true_count + error
+            assert ratio == estimate / cms.total_count
+
+    def test_add_batch_matches_add(self):
+        """Vectorized batch ingest builds the same table as looped add, with repeats"""
+        rng = random.Random(7)
+        items = [f"user_{rng.randrange(200)}" for _ in range(2000)]
+        counts = np.array([rng.randint(1, 5) for _ in items], dtype=np.int64)
+
+        looped = CountMinSketch(width=500, depth=5)
+        for item, count in zip(items, counts.tolist()):
+            looped.add(item, count)
+        batched = CountMinSketch(width=500, depth=5)
+        batched.add_batch(items, counts)
+
+        assert np.array_equal(batched.table, looped.table)
+        assert batched.total_count == looped.total_count
+
+        unit_looped = CountMinSketch(width=500, depth=5)
+        for item in items:
+            unit_looped.add(item)
+        unit = CountMinSketch(width=500, depth=5)
+        unit.add_batch(items)
+        unit.add_batch([])
+
+        assert np.array_equal(unit.table, unit_looped.table)
+        assert unit.total_count == len(items)
+
+    def test_add_and_query_matches_add_then_query(self):
+        """The fused update returns what add() followed by query() would"""
+        fused = CountMinSketch(width=100, depth=4)
+        separate = CountMinSketch(width=100, depth=4)
+        rng = random.Random(11)
+
+        for _ in range(1000):
+            item = f"ip_{rng.randrange(300)}"
+            count = rng.randint(1, 3)
+            separate.add(item, count)
+            assert fused.add_and_query(item, count) == separate.query(item)
+
+        assert np.array_equal(fused.table, separate.table)
+
+
+class TestTopK:
+    """Test TopK (Space-Saving) functionality"""
+
+    def test_min_count_and_eviction_match_reference(self):
+        """Heap-backed tracker agrees with a linear-scan reference after every add"""
+        rng = random.Random(3)
+        stream = [(f"user_{rng.randrange(40)}", rng.randint(1, 5)) for _ in range(3000)]
+
+        topk = TopK(k=10)
+        for (item, count), (expected, expected_min) in zip(stream, _reference_topk(stream, 10)):
+            topk.add(item, count)
+            assert topk.items == expected
+            assert topk.min_count == expected_min
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -70,6 +70,18 @@ class TestHyperLogLog:
         cardinality = merged.cardinality()
         assert 1470 <= cardinality <= 1530, f"Merged cardinality {cardinality} outside range"
 
+    def test_add_many_matches_add(self):
+        """Vectorized batch ingest sets exactly the registers per-item add does"""
+        items = [f"user_{i}" for i in range(5000)] + [b"raw_bytes", ""]
+        one_by_one = HyperLogLog(precision=12)
+        for item in items:
+            one_by_one.add(item)
+
+        batched = HyperLogLog(precision=12)
+        batched.add_many(items)
+
+        assert batched.registers == one_by_one.registers
+
     def test_serialization(self):
         """Test HLL serialization and deserialization"""
         hll = HyperLogLog(precision=14)
@@ -89,6 +101,22 @@ class TestHyperLogLog:
 
         assert original_cardinality == restored_cardinality
 
+    def test_packed_serialization(self):
+        """Registers serialize 6 bits each and raw one-byte payloads still load"""
+        hll = HyperLogLog(precision=12)
+        for i in range(1000):
+            hll.add(f"user_{i}")
+
+        data = hll.to_bytes()
+        assert len(data) == 1 + 3 * (1 << 12) // 4
+
+        restored = HyperLogLog.from_bytes(data)
+        assert restored.precision == 12
+        assert restored.registers == hll.registers
+
+        legacy = HyperLogLog.from_bytes(bytes(hll.registers), precision=12)
+        assert legacy.registers == hll.registers
+
     def test_empty_hll(self):
         """Test empty HLL"""
         hll = HyperLogLog(precision=14)
@@ -106,6 +134,15 @@ class TestHyperLogLog:
         cardinality = hll.cardinality()
         assert 98000 <= cardinality <= 102000, f"Cardinality {cardinality} outside range"
 
+    @pytest.mark.parametrize("n", [100, 1000, 5000, 10000, 20000, 40000, 80000])
+    def test_error_across_ranges(self, n):
+        """Estimate stays within 3 standard errors through the small/mid-range transition"""
+        hll = HyperLogLog(precision=12)
+        hll.add_many(f"user_{i}" for i in range(n))
+
+        std_error = 1.04 / (hll.m ** 0.5)
+        assert abs(hll.cardinality() - n) <= 3 * std_error * n
+
 
 class TestHyperLogLogPlus:
     """Test HyperLogLog++ (sparse representation)"""
@@ -128,17 +165,44 @@ class TestHyperLogLogPlus:
         """Test transition from sparse to dense"""
         hll = HyperLogLogPlus(precision=14)
 
-        # Add many items to trigger transition
-        for i in range(1000):
+        # Add enough items that the sparse entries outgrow the dense registers
+        for i in range(10000):
             hll.add(f"user_{i}")
+        cardinality = hll.cardinality()
 
         # Should have transitioned to dense
         assert not hll.is_sparse
 
         # Cardinality should be approximate
-        cardinality = hll.cardinality()
-        assert 980 <= cardinality <= 1020
+        assert 9800 <= cardinality <= 10200
+
+    def test_dense_registers_match_hyperloglog(self):
+        """Going dense rebuilds exactly the registers a plain HyperLogLog would have"""
+        items = [f"user_{i}" for i in range(5000)]
+        hll = HyperLogLogPlus(precision=12)
+        for item in items:
+            hll.add(item)
+        hll.cardinality()
+
+        expected = HyperLogLog(precision=12)
+        expected.add_many(items)
+
+        assert not hll.is_sparse
+        assert hll.dense.registers == expected.registers
+
+    def test_sparse_serialization(self):
+        """Delta/varint sparse payload round-trips in well under 4 bytes per entry"""
+        hll = HyperLogLogPlus(precision=14)
+        for i in range(1000):
+            hll.add(f"user_{i}")
+
+        data = hll.to_bytes()
+        restored = HyperLogLogPlus.from_bytes(data)
 
+        assert hll.is_sparse and restored.is_sparse
+        assert list(restored.sparse) == list(hll.sparse)
+        assert restored.cardinality() == hll.cardinality() == 1000
+        assert len(data) < 3.5 * len(hll.sparse) < hll.sparse.nbytes
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
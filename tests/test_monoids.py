@@ -2,11 +2,30 @@
 Tests for Monoid implementations
 """
 import pytest
-from app.core.monoid import Monoid, IntMonoid, StringMonoid, MaxMonoid, MinMonoid
-from app.core.monoids.hll_monoid import HLLMonoid
-from app.core.monoids.bloom_monoid import BloomFilterUnionMonoid
+from app.core.monoid import (
+    Monoid,
+    IntMonoid,
+    FloatMonoid,
+    StringMonoid,
+    MaxMonoid,
+    MinMonoid,
+    merge_map,
+    merge_map_numeric,
+    sum_monoid,
+    tree_reduce,
+)
+from app.core.monoids.hll_monoid import HLLMonoid, build_hlls_batch
+from app.core.monoids.bloom_monoid import BloomFilterMonoid, BloomFilterUnionMonoid
 from app.core.monoids.topk_monoid import TopKMonoid
-from app.core.monoids.moments_monoid import MomentsMonoid, RunningStatistics
+from app.core.sketches.bloom_filter import BloomFilter as SketchBloomFilter
+from app.core.monoids.moments_monoid import (
+    MOMENTS_DTYPE,
+    MomentsArray,
+    MomentsMonoid,
+    RunningStatistics,
+    moments_to_record,
+    record_to_moments,
+)
 from app.core.sketches.hyperloglog import HyperLogLog
 from app.core.sketches.bloom_filter import BloomFilter
 from app.core.sketches.count_min import TopK
@@ -23,6 +42,14 @@ class TestBasicMonoids:
         assert monoid.plus(5, 3) == 8
         assert monoid.sum([1, 2, 3, 4, 5]) == 15
 
+    def test_float_monoid(self):
+        """Test float addition monoid sums without accumulated rounding error"""
+        monoid = FloatMonoid()
+
+        assert monoid.plus(1.5, 2.5) == 4.0
+        assert monoid.sum([0.1] * 10) == 1.0
+        assert monoid.sum([]) == 0.0
+
     def test_string_monoid(self):
         """Test string concatenation monoid"""
         monoid = StringMonoid()
@@ -38,6 +65,7 @@ class TestBasicMonoids:
         assert monoid.zero() == float('-inf')
         assert monoid.plus(5, 3) == 5
         assert monoid.sum([1, 5, 3, 9, 2]) == 9
+        assert monoid.sum([]) == float('-inf')
 
     def test_min_monoid(self):
         """Test min monoid"""
@@ -48,6 +76,102 @@ class TestBasicMonoids:
         assert monoid.sum([5, 1, 9, 2, 7]) == 1
 
 
+class TestMonoidUtilities:
+    """Test tree_reduce, sum_monoid dispatch and numeric map merges"""
+
+    def test_tree_reduce_empty(self):
+        """Empty input has no identity to return"""
+        with pytest.raises(ValueError):
+            tree_reduce(lambda a, b: a + b, [])
+
+    def test_tree_reduce_single(self):
+        """A single element is returned without calling plus"""
+        def plus(a, b):
+            raise AssertionError("plus should not be called")
+
+        item = ["only"]
+        assert tree_reduce(plus, [item]) is item
+
+    @pytest.mark.parametrize("n", [2, 5, 8, 13])
+    def test_tree_reduce_preserves_order(self, n):
+        """Odd and even lengths keep left-to-right order with n - 1 plus calls"""
+        calls = []
+
+        def plus(a, b):
+            calls.append((a, b))
+            return a + b
+
+        items = [chr(ord("a") + i) for i in range(n)]
+        assert tree_reduce(plus, items) == "".join(items)
+        assert len(calls) == n - 1
+
+    def test_sum_monoid_empty(self):
+        """Empty input returns each monoid's zero"""
+        assert sum_monoid(IntMonoid(), []) == 0
+        assert sum_monoid(MaxMonoid(), []) == float('-inf')
+        assert sum_monoid(MinMonoid(), []) == float('inf')
+        assert sum_monoid(StringMonoid(), []) == ""
+
+    def test_sum_monoid_single(self):
+        """A single item is returned unchanged"""
+        assert sum_monoid(IntMonoid(), [7]) == 7
+        assert sum_monoid(MaxMonoid(), [7]) == 7
+        assert sum_monoid(MinMonoid(), [7]) == 7
+        assert sum_monoid(StringMonoid(), ["x"]) == "x"
+
+    def test_sum_monoid_odd_length(self):
+        """Odd-length inputs match a plain fold"""
+        items = [4, 1, 9, 3, 7]
+
+        assert sum_monoid(IntMonoid(), items) == 24
+        assert sum_monoid(MaxMonoid(), items) == 9
+        assert sum_monoid(MinMonoid(), items) == 1
+        assert sum_monoid(StringMonoid(), ["a", "b", "c"]) == "abc"
+
+    def test_sum_monoid_mixed_types(self):
+        """Mixed int/float inputs sum and compare correctly whichever type comes first"""
+        assert sum_monoid(IntMonoid(), [1, 2.5, 3]) == 6.5
+        assert sum_monoid(FloatMonoid(), [0.5, 1, 2]) == 3.5
+        assert sum_monoid(FloatMonoid(), [0.1] * 10) == 1.0
+        assert sum_monoid(MaxMonoid(), [1, 2.5, 2]) == 2.5
+        assert sum_monoid(MinMonoid(), [1.5, 1, 2]) == 1
+
+    def test_merge_map_numeric_empty_and_single(self):
+        """No maps gives {}; one map gives an equal copy"""
+        source = {"a": 1}
+
+        assert merge_map_numeric("sum", []) == {}
+        merged = merge_map_numeric("sum", [source])
+        assert merged == source
+        assert merged is not source
+
+    def test_merge_map_numeric_odd_length(self):
+        """Three maps with partly overlapping keys merge per op"""
+        maps = [{"a": 1, "b": 5}, {"b": 2, "c": 3}, {"a": 4, "c": 1}]
+
+        assert merge_map_numeric("sum", maps) == {"a": 5, "b": 7, "c": 4}
+        assert merge_map_numeric("max", maps) == {"a": 4, "b": 5, "c": 3}
+        assert merge_map_numeric("min", maps) == {"a": 1, "b": 2, "c": 1}
+
+    def test_merge_map_numeric_mixed_types(self):
+        """Int and float values combine without losing the float part"""
+        maps = [{"a": 1, "b": 0.5}, {"a": 0.25, "b": 2}]
+
+        assert merge_map_numeric("sum", maps) == {"a": 1.25, "b": 2.5}
+        assert merge_map_numeric("max", maps) == {"a": 1, "b": 2}
+
+    def test_merge_map_numeric_unknown_op(self):
+        """Unsupported ops are rejected"""
+        with pytest.raises(ValueError):
+            merge_map_numeric("avg", [{"a": 1}])
+
+    def test_merge_map_dispatch(self):
+        """Numeric monoids take the builtin path; others keep plus order"""
+        assert merge_map(IntMonoid(), [{"a": 1}, {"a": 2}, {"b": 3}]) == {"a": 3, "b": 3}
+        assert merge_map(MaxMonoid(), [{"a": 1, "b": "x"}, {"a": 2}]) == {"a": 2, "b": "x"}
+        assert merge_map(StringMonoid(), [{"k": "a"}, {"k": "b"}, {"k": "c"}]) == {"k": "abc"}
+
+
 class TestHLLMonoid:
     """Test HyperLogLog Monoid"""
 
@@ -117,6 +241,91 @@ class TestHLLMonoid:
         cardinality = daily.cardinality()
         assert 490 <= cardinality <= 510
 
+    def test_plus_preserves_bytearray_registers(self):
+        """Merging bytearray-register sketches keeps the sketch type and layout"""
+        monoid = HLLMonoid(precision=12)
+        hll1 = HyperLogLog(precision=12)
+        hll2 = HyperLogLog(precision=12)
+        hll1.add_many(f"user_{i}" for i in range(300))
+        hll2.add_many(f"user_{i}" for i in range(200, 500))
+
+        merged = monoid.plus(hll1, hll2)
+        identity = monoid.plus(HyperLogLog(precision=12), hll2)
+
+        for result, expected in ((merged, hll1.merge(hll2)), (identity, hll2)):
+            assert isinstance(result, HyperLogLog)
+            assert isinstance(result.registers, bytearray)
+            assert result.registers == expected.registers
+            restored = HyperLogLog.from_bytes(result.to_bytes(), precision=12)
+            assert restored.registers == result.registers
+
+    def test_plus_keeps_input_precision(self):
+        """Operands whose precision differs from the monoid's merge at their own precision"""
+        monoid = HLLMonoid(precision=14)
+        hll1 = HyperLogLog(precision=12)
+        hll2 = HyperLogLog(precision=12)
+        hll1.add_many(f"user_{i}" for i in range(1000))
+        hll2.add_many(f"user_{i}" for i in range(500, 1500))
+
+        merged = monoid.plus(hll1, hll2)
+        expected = hll1.merge(hll2)
+
+        assert merged.precision == 12
+        assert merged.m == expected.m
+        assert merged.registers == expected.registers
+        assert merged.cardinality() == expected.cardinality()
+
+    def test_fast_merge_matches_pairwise(self):
+        """fast_merge equals folding pairwise merges and keeps bytearray registers"""
+        monoid = HLLMonoid(precision=12)
+        hlls = []
+        for worker in range(5):
+            hll = HyperLogLog(precision=12)
+            hll.add_many(f"user_{i}" for i in range(worker * 100, worker * 100 + 250))
+            hlls.append(hll)
+
+        merged = monoid.fast_merge(hlls)
+        expected = hlls[0]
+        for hll in hlls[1:]:
+            expected = expected.merge(hll)
+
+        assert isinstance(merged, HyperLogLog)
+        assert isinstance(merged.registers, bytearray)
+        assert merged.registers == expected.registers
+        assert merged.cardinality() == expected.cardinality()
+
+    @pytest.mark.parametrize("precision,workers", [(12, 8), (16, 64)])
+    def test_merge_distributed_matches_fast_merge(self, precision, workers):
+        """Distributed merge (GPU when gated in and available, else CPU) equals fast_merge"""
+        monoid = HLLMonoid(precision=precision)
+        hlls = []
+        for worker in range(workers):
+            hll = HyperLogLog(precision=precision)
+            hll.add_many(f"user_{i}" for i in range(worker * 50, worker * 50 + 100))
+            hlls.append(hll)
+
+        merged = monoid.merge_distributed(hlls)
+
+        assert isinstance(merged.registers, bytearray)
+        assert merged.registers == monoid.fast_merge(hlls).registers
+
+    def test_build_hlls_batch_matches_add(self):
+        """Batch-built sketches have the same registers as per-key add()"""
+        key_sets = [
+            [f"user_{i}" for i in range(400)],
+            [f"user_{i}" for i in range(200, 700)],
+            [],
+        ]
+
+        hlls = build_hlls_batch(12, key_sets)
+
+        assert len(hlls) == len(key_sets)
+        for hll, keys in zip(hlls, key_sets):
+            expected = HyperLogLog(precision=12)
+            for key in keys:
+                expected.add(key)
+            assert hll.registers == expected.registers
+
 
 class TestBloomFilterMonoid:
     """Test Bloom Filter Monoid"""
@@ -166,6 +375,39 @@ class TestBloomFilterMonoid:
         assert "user2" in bf_union
         assert "user3" in bf_union
 
+    def test_sum_of_in_tree_filters_matches_pairwise_union(self):
+        """The vectorized sum of in-tree filters equals chained union() and keeps inputs intact"""
+        filters = []
+        for hour in range(24):
+            bf = SketchBloomFilter(capacity=1000, error_rate=0.01)
+            for i in range(20):
+                bf.add(f"user_{hour}_{i}")
+            filters.append(bf)
+        before = [bytes(bf.bit_array) for bf in filters]
+
+        expected = filters[0]
+        for bf in filters[1:]:
+            expected = expected.union(bf)
+
+        for merged in (
+            BloomFilterUnionMonoid(capacity=1000, error_rate=0.01).sum(filters),
+            BloomFilterMonoid().sum_union(filters),
+        ):
+            assert type(merged) is SketchBloomFilter
+            assert bytes(merged.bit_array) == bytes(expected.bit_array)
+            assert all(f"user_{h}_{i}" in merged for h in range(24) for i in range(20))
+        assert [bytes(bf.bit_array) for bf in filters] == before
+
+    def test_sum_of_mismatched_in_tree_filters_raises(self):
+        """Filters sized differently cannot be OR-ed together"""
+        filters = [
+            SketchBloomFilter(capacity=1000, error_rate=0.01),
+            SketchBloomFilter(capacity=2000, error_rate=0.01),
+        ]
+
+        with pytest.raises(ValueError):
+            BloomFilterMonoid().sum_union(filters)
+
 
 class TestTopKMonoid:
     """Test TopK Monoid"""
@@ -274,6 +516,55 @@ class TestMomentsMonoid:
         assert daily.count == 9
         assert 110 < daily.mean < 120
 
+    def test_streamed_statistics_match_from_values(self):
+        """Per-value online updates and from_windows agree with from_values"""
+        monoid = MomentsMonoid()
+        windows = [
+            [1.0, 2.0, 2.0, 3.0, 50.0],
+            [4.5, 4.5, 6.0],
+            [],
+            [100.0, 0.5, 7.25, 8.0, 8.0, 9.0, 12.0],
+        ]
+        values = [v for w in windows for v in w]
+        expected = monoid.from_values(values)
+
+        stats = RunningStatistics()
+        for value in values:
+            stats.add(value)
+        windowed = monoid.from_windows(windows)
+        merged = monoid.sum_time_windows([monoid.from_values(w) for w in windows])
+
+        for result in (stats, windowed, merged):
+            assert result.count == expected.count
+            assert result.mean == pytest.approx(expected.mean)
+            assert result.variance == pytest.approx(expected.variance)
+            assert result.skewness == pytest.approx(expected.skewness)
+            assert result.kurtosis == pytest.approx(expected.kurtosis)
+        assert monoid.from_windows([]) == monoid.zero()
+
+    def test_moments_array_merge_matches_plus(self):
+        """Row-wise SoA merge agrees with pairwise plus, including empty rows"""
+        monoid = MomentsMonoid()
+        left = [monoid.from_values([1, 2, 3]), monoid.zero(), monoid.from_values([10, 20])]
+        right = [monoid.from_values([4, 5, 9]), monoid.from_values([7, 8]), monoid.zero()]
+
+        merged = MomentsArray.from_moments(left).merge(MomentsArray.from_moments(right))
+
+        for i, (a, b) in enumerate(zip(left, right)):
+            expected = monoid.plus(a, b)
+            assert merged.to_moments(i) == pytest.approx(expected)
+
+    def test_moments_records_round_trip(self):
+        """Moments survive packing into MOMENTS_DTYPE records and back"""
+        monoid = MomentsMonoid()
+        moments = [monoid.from_values([1, 2, 3]), monoid.from_values([4, 8])]
+
+        records = MomentsArray.from_moments(moments).to_records()
+
+        assert records.dtype == MOMENTS_DTYPE
+        assert [record_to_moments(r) for r in records] == moments
+        assert record_to_moments(moments_to_record(moments[0])) == moments[0]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,103 @@
+"""
+Tests for the Redis storage layer
+"""
+from datetime import datetime
+
+import pytest
+from app.core.sketches.bloom_filter import BloomFilter as SketchBloomFilter, ScalableBloomFilter
+from app.core.storage import BLOOM_MAGIC, BloomFilter, RedisStorage, dump_bloom, load_bloom
+from app.utils.time_windows import RedisKeyGenerator, TimeWindow
+
+
+class RedisBloomDouble:
+    """Minimal Redis client with the RedisBloom module loaded"""
+
+    def __init__(self):
+        self.values = {}  # plain keys -> bytes
+        self.filters = {}  # BF.* keys -> set of members
+
+    def module_list(self):
+        return [{b"name": b"bf", b"ver": 20612}]
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def execute_command(self, command, key, *args):
+        assert command == "BF.EXISTS"
+        return int(args[0] in self.filters.get(key, ()))
+
+
+class TestCheckBloom:
+    """Test Bloom membership reads"""
+
+    TIMESTAMP = datetime(2025, 10, 16, 10, 30)
+
+    def _storage(self):
+        redis = RedisBloomDouble()
+        storage = RedisStorage(redis_client=redis)
+        assert storage.native_bloom
+        return storage, redis
+
+    def test_native_miss_falls_back_to_legacy_key(self):
+        """History in a serialized bloom:* filter stays visible with RedisBloom enabled"""
+        storage, redis = self._storage()
+        legacy = BloomFilter(capacity=1000, error_rate=0.01)
+        legacy.add("user1:prod")
+        key = RedisKeyGenerator.bloom_key("user_activity", "prod", TimeWindow.DAY, self.TIMESTAMP)
+        redis.values[key] = dump_bloom(legacy)
+
+        assert storage.check_bloom("user_activity", "prod", "user1:prod", self.TIMESTAMP)
+        assert not storage.check_bloom("user_activity", "prod", "user2:prod", self.TIMESTAMP)
+
+    def test_native_hit_skips_legacy_key(self):
+        """A BF.EXISTS hit answers without reading the legacy filter"""
+        storage, redis = self._storage()
+        key = RedisKeyGenerator.native_bloom_key(
+            "user_activity", "prod", TimeWindow.DAY, self.TIMESTAMP
+        )
+        redis.filters[key] = {"user1:prod"}
+        redis.get = None  # any legacy read would fail
+
+        assert storage.check_bloom("user_activity", "prod", "user1:prod", self.TIMESTAMP)
+
+    def test_no_filters(self):
+        """Neither a native nor a legacy filter means not seen"""
+        storage, _ = self._storage()
+
+        assert not storage.check_bloom("user_activity", "prod", "user1:prod", self.TIMESTAMP)
+
+
+class TestBloomSerialization:
+    """Test Bloom filter payloads stored under bloom:* keys"""
+
+    def test_in_tree_filter_uses_compact_payload(self):
+        """The in-tree filter stores a header plus its bit array and keeps its members"""
+        bloom = SketchBloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(100):
+            bloom.add(f"user_{i}")
+
+        data = dump_bloom(bloom)
+        restored = load_bloom(data)
+
+        assert data.startswith(BLOOM_MAGIC)
+        assert len(data) < len(bloom.to_bytes()) + 32
+        assert type(restored) is SketchBloomFilter
+        assert bytes(restored.bit_array) == bytes(bloom.bit_array)
+        assert all(f"user_{i}" in restored for i in range(100))
+
+    def test_other_filters_are_pickled(self):
+        """Any other filter type round-trips through pickle with its full state"""
+        bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+        for i in range(500):
+            bloom.add(f"user_{i}")
+
+        data = dump_bloom(bloom)
+        restored = load_bloom(data)
+
+        assert not data.startswith(BLOOM_MAGIC)
+        assert type(restored) is ScalableBloomFilter
+        assert all(f"user_{i}" in restored for i in range(500))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])